@@ -60,7 +60,7 @@ hci_logger : logging.Logger
 
 """
 import logging
-from typing import Dict
+from typing import Dict, Tuple
 
 
 class _CustomFormatter(logging.Formatter):
@@ -116,6 +116,11 @@ class _CustomFormatter(logging.Formatter):
 
     precise_time = False
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # per-level formatters, built on first use of each level
+        self._formatters: Dict[Tuple[int, bool], logging.Formatter] = {}
+
     def format(self, record: logging.LogRecord) -> str:
         """Creates and returns formatted log message.
 
@@ -130,12 +135,18 @@ class _CustomFormatter(logging.Formatter):
             The formatted log message.
 
         """
-        log_fmt = self.FORMATS.get(record.levelno)
+        key = (record.levelno, self.precise_time)
+        formatter = self._formatters.get(key)
+
+        if formatter is None:
+            log_fmt = self.FORMATS.get(record.levelno)
+
+            if not self.precise_time:
+                formatter = logging.Formatter(fmt=log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+            else:
+                formatter = logging.Formatter(fmt=log_fmt)
 
-        if not self.precise_time:
-            formatter = logging.Formatter(fmt=log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
-        else:
-            formatter = logging.Formatter(fmt=log_fmt)
+            self._formatters[key] = formatter
 
         return formatter.format(record)
 
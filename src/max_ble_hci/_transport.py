@@ -53,14 +53,15 @@
 Contains serial port functionality for the HCI implementation.
 """
 import datetime
+import logging
 import sys
-import time
 import weakref
-from multiprocessing import Process
-from threading import Event, Lock, Thread
+from collections import deque
+from concurrent.futures import Future
+from threading import Condition, Event, Lock, Thread, current_thread
 
 # pylint: disable=too-many-instance-attributes, too-many-arguments
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import serial
 
@@ -70,6 +71,22 @@ from .hci_packets import AsyncPacket, CommandPacket, EventPacket
 from .packet_codes import EventCode
 from .packet_defs import PacketType
 
+# Upper bound on how long the read thread blocks waiting for data, which
+# is also how long stopping the thread can take.
+_PORT_READ_TIMEOUT = 0.1
+
+# Raw packet type of ACL data packets, which carry a 4-byte header.
+_ASYNC_PKT_TYPE = PacketType.ASYNC.value
+
+# Upper bound on held command events. A burst never exceeds the one-byte
+# command credit count, so no response to a pending burst is dropped.
+_MAX_PENDING_EVENTS = 256
+
+# Raw event codes of the responses to commands.
+_CMD_RESPONSE_CODES = frozenset(
+    (EventCode.COMMAND_COMPLETE.value, EventCode.COMMAND_STATUS.value)
+)
+
 
 class SerialUartTransport:
     """HCI UART serial port transportation object.
@@ -167,10 +184,20 @@ class SerialUartTransport:
         self.evt_callback = evt_callback
         self.recover_on_power_loss = recover_on_power_loss
 
-        self._event_packets = []
+        # command events pending retrieval, stale events are
+        # dropped before each write so replies line up with requests
+        self._event_packets = deque(maxlen=_MAX_PENDING_EVENTS)
+        self._pkt_cond = None
+        # controller command credits (Num_HCI_Command_Packets), the
+        # host may assume one until the controller reports otherwise
+        self._cmd_credits = 1
+        # futures of submitted commands awaiting a response, by opcode
+        self._pending_futures: Dict[int, deque] = {}
+        # opcodes of the blocking send awaiting its responses
+        self._sync_opcodes = frozenset()
+        self._futures_lock = Lock()
         self._read_thread = None
         self._kill_evt = None
-        self._data_lock = None
         self._port_lock = None
 
         self.baud = baud
@@ -187,15 +214,28 @@ class SerialUartTransport:
     def __exit__(self, exc_type, exc_value, traceback):
         with self._port_lock:
             self.stop()
-            self.port.close()
+            # the port is gone if stopped while recovering from power loss
+            if self.port is not None:
+                self.port.close()
             getattr(SerialUartTransport, "instances").pop(self.port_id)
 
     def __del__(self):
-        if self._read_thread and self._read_thread.is_alive():
-            self.stop()
-        if self.port and self.port.isOpen():
-            self.port.close()
-            getattr(SerialUartTransport, "instances").pop(self.port_id)
+        # best-effort and bounded: attributes may be missing if
+        # __init__ failed, and finalizers must not stall shutdown
+        kill_evt = getattr(self, "_kill_evt", None)
+        read_thread = getattr(self, "_read_thread", None)
+        port = getattr(self, "port", None)
+
+        if kill_evt is not None:
+            kill_evt.set()
+        if (
+            read_thread is not None
+            and read_thread.is_alive()
+            and read_thread is not current_thread()
+        ):
+            read_thread.join(timeout=5 * _PORT_READ_TIMEOUT)
+        if port is not None and port.is_open:
+            port.close()
 
     def start(self):
         """Start the port read thread.
@@ -226,10 +266,18 @@ class SerialUartTransport:
         if self._read_thread.is_alive():
             self.stop()
 
+        # the port is gone if stopped while recovering from power loss
+        if self.port is None:
+            return
+
         if self.port.is_open:
             self.port.flush()
             self.port.close()
-            getattr(SerialUartTransport, "instances").pop(self.port_id)
+
+            # a newer transport may have taken over this port's entry
+            instances = getattr(SerialUartTransport, "instances")
+            if instances.get(self.port_id) is self:
+                del instances[self.port_id]
 
     def send_command(
         self, pkt: CommandPacket, timeout: Optional[float] = None
@@ -253,10 +301,50 @@ class SerialUartTransport:
         EventPacket
             The retrieved packet.
 
+        Raises
+        ------
+        RuntimeError
+            If a submitted command of the same opcode is
+            awaiting its response.
+
         """
 
         return self._write(pkt.to_bytes(), timeout)
 
+    def send_commands(
+        self, pkts: List[CommandPacket], timeout: Optional[float] = None
+    ) -> List[EventPacket]:
+        """Send several commands over the serial connection.
+
+        Writes the given commands back-to-back without waiting
+        for the individual responses, as far as the controller's
+        command credits allow, and retrieves one response per
+        command. Controllers that only accept a single outstanding
+        command are served one command at a time.
+
+        Parameters
+        ----------
+        pkts : List[CommandPacket]
+            Commands that should be transported, in order.
+        timeout : Optional[float], optional
+            Timeout for each response retrieval. Can be used
+            to temporarily override this object's `timeout`
+            attribute.
+
+        Returns
+        -------
+        List[EventPacket]
+            The retrieved packets, in command order.
+
+        Raises
+        ------
+        RuntimeError
+            If a submitted command of the same opcode as one
+            of `pkts` is awaiting its response.
+
+        """
+        return self._write_many([pkt.to_bytes() for pkt in pkts], timeout)
+
     def send_command_raw(
         self,
         raw_command: bytearray,
@@ -280,11 +368,68 @@ class SerialUartTransport:
         """
         return self._write(raw_command, timeout)
 
+    def submit_command(self, pkt: CommandPacket) -> Future:
+        """Send a command without waiting for the response.
+
+        Writes the given command to the DUT and returns a future
+        which is completed by the port read thread once the
+        response carrying the command's opcode is received.
+        Cancelling the future withdraws it, so a late response is
+        not consumed on its behalf.
+
+        Submitting does not wait for command credits. The caller
+        must not have more commands outstanding than the
+        controller's Num_HCI_Command_Packets allows, which is one
+        unless the controller has reported more.
+
+        Responses are matched by opcode alone, so a command cannot
+        be submitted while a blocking send of the same opcode awaits
+        its response, and vice versa.
+
+        Parameters
+        ----------
+        pkt : CommandPacket
+            Command that should be transported.
+
+        Returns
+        -------
+        Future
+            Future resolving to the response `EventPacket`.
+
+        Raises
+        ------
+        RuntimeError
+            If a blocking send of the same opcode is awaiting
+            its response.
+
+        """
+        fut = Future()
+        opcode = pkt.opcode
+        serialized = pkt.to_bytes()
+        # registered and written under one lock, so futures of the
+        # same opcode queue in the order their commands went out
+        with self._futures_lock:
+            if opcode in self._sync_opcodes:
+                raise RuntimeError(
+                    f"Command 0x{opcode:04X} is awaiting a blocking response."
+                )
+            self._pending_futures.setdefault(opcode, deque()).append(fut)
+            self.port.write(serialized)
+        fut.add_done_callback(lambda done: self._discard_future(opcode, done))
+
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "%s  %s>%s", datetime.datetime.now(), self.id_tag, serialized.hex()
+            )
+
+        return fut
+
     def retrieve_packet(self, timeout: Optional[float] = None) -> EventPacket:
         """Retrieve a packet from the serial line.
 
-        Retrieves a single packet from the front of the
-        serial port queue.
+        Retrieves the most recently received packet from
+        the serial port queue, older pending packets are
+        discarded.
 
         Parameters
         ----------
@@ -299,7 +444,7 @@ class SerialUartTransport:
             The retrieved packet.
 
         """
-        return self._retrieve(timeout)
+        return self._retrieve(timeout, latest=True)
 
     def _init_read_thread(self) -> None:
         """Initializes the port read thread and data locks.
@@ -314,8 +459,8 @@ class SerialUartTransport:
             daemon=True,
             name=f"Thread-{self.id_tag}",
         )
-        self._data_lock = Lock()
         self._port_lock = Lock()
+        self._pkt_cond = Condition()
         self.start()
 
     def _init_port(
@@ -335,7 +480,7 @@ class SerialUartTransport:
                 bytesize=serial.EIGHTBITS,
                 rtscts=flowcontrol,
                 dsrdtr=False,
-                timeout=2.0,
+                timeout=_PORT_READ_TIMEOUT,
                 exclusive=exclusive,
             )
 
@@ -348,10 +493,32 @@ class SerialUartTransport:
             self.logger.error("%s: %s", type(err).__name__, err)
             sys.exit(1)
 
+        self._tune_port()
+
+    def _tune_port(self) -> None:
+        """Applies optional low-latency port settings.
+
+        PRIVATE
+
+        """
+        # USB serial adapters hold small reads back for their latency
+        # timer (16 ms on FTDI) unless low-latency mode is set, neither
+        # setting is supported on every platform or adapter
+        try:
+            self.port.set_low_latency_mode(True)
+        except (AttributeError, OSError, ValueError) as err:
+            self.logger.debug("Low latency mode unavailable: %s", err)
+
+        try:
+            self.port.set_buffer_size(rx_size=65536, tx_size=65536)
+        except (AttributeError, OSError, ValueError) as err:
+            self.logger.debug("Port buffer size unavailable: %s", err)
+
     def _recover_power_loss(self):
         self.port = None
 
-        while True:
+        # retry at the read poll cadence, waking early on stop()
+        while not self._kill_evt.wait(_PORT_READ_TIMEOUT):
             try:
                 self.port = serial.Serial(
                     port=self.port_id,
@@ -361,15 +528,15 @@ class SerialUartTransport:
                     bytesize=serial.EIGHTBITS,
                     rtscts=self.flowcontrol,
                     dsrdtr=False,
-                    timeout=2.0,
+                    timeout=_PORT_READ_TIMEOUT,
                     exclusive=self.exclusive_port,
                 )
-
-                break
             except serial.SerialException:
-                pass
+                continue
 
-        self.logger.info("Device reconnected")
+            self._tune_port()
+            self.logger.info("Device reconnected")
+            break
 
     def _read(self, kill_evt: Event) -> None:
         """Process executed by the port read thread.
@@ -377,57 +544,156 @@ class SerialUartTransport:
         PRIVATE
 
         """
+        rx_buf = bytearray()
+        is_killed = kill_evt.is_set
+        lock_acquire = self._port_lock.acquire
+        lock_release = self._port_lock.release
+        process_rx = self._process_rx
 
-        while not kill_evt.is_set():
+        while not is_killed():
             # pylint: disable=consider-using-with
             try:
-                if self.port.in_waiting and self._port_lock.acquire(blocking=False):
-                    pkt_type = self.port.read(1)
-                    if pkt_type[0] == PacketType.ASYNC.value:
-                        read_data = self.port.read(4)
-                        data_len = read_data[2] | (read_data[3] << 8)
-                    else:
-                        read_data = self.port.read(2)
-                        data_len = read_data[1]
-
-                    read_data += self.port.read(data_len)
-                    self._port_lock.release()
-                    self.logger.info(
-                        "%s  %s<%02X%s",
-                        datetime.datetime.now(),
-                        self.id_tag,
-                        pkt_type[0],
-                        read_data.hex(),
-                    )
-
-                    with self._data_lock:
-                        if (
-                            pkt_type[0] == PacketType.ASYNC.value
-                            and self.async_callback
-                        ):
-                            self.async_callback(AsyncPacket.from_bytes(read_data))
-                        else:
-                            pkt = EventPacket.from_bytes(read_data)
-                            if pkt.evt_code in {
-                                EventCode.COMMAND_COMPLETE,
-                                EventCode.COMMAND_STATUS,
-                            }:
-                                # only need one command event at a time
-                                if self._event_packets:
-                                    self._event_packets.pop(0)
-                                self._event_packets.append(pkt)
-                            elif self.evt_callback:
-                                self.evt_callback(pkt)
+                # wait for the lock rather than spin, rechecking for stop
+                if not lock_acquire(timeout=_PORT_READ_TIMEOUT):
+                    continue
+                try:
+                    # blocks for at most the port timeout, then drains
+                    # whatever else arrived in the same burst
+                    port = self.port
+                    read_data = port.read(port.in_waiting or 1)
+                finally:
+                    lock_release()
+
+                if read_data:
+                    rx_buf += read_data
+                    process_rx(rx_buf)
             except OSError as err:
                 if not self.recover_on_power_loss:
                     raise err
 
                 self.logger.error("Device lost! Waiting for reconnection.")
                 self._recover_power_loss()
+                rx_buf.clear()
+
+    def _process_rx(self, rx_buf: bytearray) -> None:
+        """Dispatches every complete packet held in the receive buffer.
+
+        PRIVATE
+
+        """
+        pos = 0
+        buf_len = len(rx_buf)
+        # timestamps and hex dumps are only built when they get logged
+        log_rx = self.logger.isEnabledFor(logging.INFO)
+        dispatch = self._dispatch_packet
+
+        while pos < buf_len:
+            pkt_type = rx_buf[pos]
+            if pkt_type == _ASYNC_PKT_TYPE:
+                if buf_len - pos < 5:
+                    break
+                end = pos + 5 + (rx_buf[pos + 3] | (rx_buf[pos + 4] << 8))
+            else:
+                if buf_len - pos < 3:
+                    break
+                end = pos + 3 + rx_buf[pos + 2]
+
+            if end > buf_len:
+                break
+
+            read_data = bytes(rx_buf[pos + 1 : end])
+            pos = end
+
+            if log_rx:
+                self.logger.info(
+                    "%s  %s<%02X%s",
+                    datetime.datetime.now(),
+                    self.id_tag,
+                    pkt_type,
+                    read_data.hex(),
+                )
+
+            dispatch(pkt_type, read_data)
+
+        del rx_buf[:pos]
+
+    def _dispatch_packet(self, pkt_type: int, read_data: bytes) -> None:
+        """Hands a framed packet to its callback or to the waiting caller.
+
+        PRIVATE
+
+        """
+        if pkt_type == _ASYNC_PKT_TYPE and self.async_callback:
+            self.async_callback(AsyncPacket.from_bytes(read_data))
+            return
+
+        pkt = EventPacket.from_bytes(read_data)
+        if read_data[0] not in _CMD_RESPONSE_CODES:
+            if self.evt_callback:
+                self.evt_callback(pkt)
+            return
+
+        if self._pending_futures and self._resolve_future(pkt):
+            return
+
+        # the waiting caller is woken at once, not after the callbacks
+        # of the rest of the burst have run
+        with self._pkt_cond:
+            self._event_packets.append(pkt)
+            self._pkt_cond.notify()
+
+    def _resolve_future(self, pkt: EventPacket) -> bool:
+        """Completes the oldest live future submitted for the response opcode.
+
+        PRIVATE
+
+        """
+        opcode = pkt.evt_params[1] | (pkt.evt_params[2] << 8)
+        fut = None
+        with self._futures_lock:
+            waiters = self._pending_futures.get(opcode)
+            if not waiters:
+                return False
+            while waiters:
+                candidate = waiters.popleft()
+                # false for a cancelled future, which is skipped
+                if candidate.set_running_or_notify_cancel():
+                    fut = candidate
+                    break
+            if not waiters:
+                del self._pending_futures[opcode]
+
+        if fut is None:
+            return False
+
+        self._cmd_credits = max(pkt.evt_params[0], 1)
+        fut.set_result(pkt)
+        return True
+
+    def _discard_future(self, opcode: int, fut: Future) -> None:
+        """Withdraws a cancelled future from the pending futures.
+
+        PRIVATE
+
+        """
+        if not fut.cancelled():
+            return
+
+        with self._futures_lock:
+            waiters = self._pending_futures.get(opcode)
+            if waiters is None:
+                return
+            try:
+                waiters.remove(fut)
+            except ValueError:
+                return
+            if not waiters:
+                del self._pending_futures[opcode]
 
     def _retrieve(
         self,
         timeout: Optional[float],
+        latest: bool = False,
     ) -> EventPacket:
         """Reads an event from serial port.
 
@@ -437,25 +703,19 @@ class SerialUartTransport:
         if timeout is None:
             timeout = self.timeout
 
-        timeout_process = Process(target=time.sleep, args=(timeout,))
-        timeout_process.start()
-
-        while self._read_thread.is_alive():
-            if self._event_packets:
-                timeout_process.terminate()
-                timeout_process.join()
-                timeout_process.close()
-                break
-            if timeout_process.exitcode is None:
-                continue
-            raise TimeoutError(
-                "Timeout occured before DUT could respond. Check connection and retry."
-            )
+        with self._pkt_cond:
+            if not self._pkt_cond.wait_for(lambda: self._event_packets, timeout):
+                raise TimeoutError(
+                    "Timeout occured before DUT could respond. "
+                    "Check connection and retry."
+                )
 
-        with self._data_lock:
-            evt = self._event_packets.pop(0)
+            if latest:
+                evt = self._event_packets.pop()
+                self._event_packets.clear()
+                return evt
 
-        return evt
+            return self._event_packets.popleft()
 
     def _write(self, pkt: bytearray, timeout: Optional[float]) -> EventPacket:
         """Sends a command to the test board and retrieves the response.
@@ -463,18 +723,98 @@ class SerialUartTransport:
         PRIVATE
 
         """
+        try:
+            self._send_burst([pkt])
+            return self._retrieve_response(timeout)
+        finally:
+            self._sync_opcodes = frozenset()
 
-        tries = self.retries
-        timeout_err = None
+    def _write_many(
+        self, pkts: List[bytearray], timeout: Optional[float]
+    ) -> List[EventPacket]:
+        """Sends commands in credit-sized bursts and retrieves the responses.
+
+        PRIVATE
+
+        """
+        evts = []
+        idx = 0
+
+        try:
+            while idx < len(pkts):
+                burst = pkts[idx : idx + self._cmd_credits]
+                idx += len(burst)
+                self._send_burst(burst)
+
+                # responses are matched to commands by opcode, a response
+                # to a command outside this burst is stale and dropped
+                pending = [pkt[1] | (pkt[2] << 8) for pkt in burst]
+                burst_evts = [None] * len(burst)
+                remaining = len(burst)
+
+                while remaining:
+                    evt = self._retrieve_response(timeout)
+                    opcode = evt.evt_params[1] | (evt.evt_params[2] << 8)
+                    try:
+                        slot = pending.index(opcode)
+                    except ValueError:
+                        self.logger.warning(
+                            "Dropping response to unexpected opcode 0x%04X", opcode
+                        )
+                        continue
+
+                    pending[slot] = None
+                    burst_evts[slot] = evt
+                    remaining -= 1
+
+                evts.extend(burst_evts)
+        finally:
+            self._sync_opcodes = frozenset()
+
+        return evts
+
+    def _send_burst(self, pkts: List[bytearray]) -> None:
+        """Writes serialized commands to the port in a single write.
+
+        PRIVATE
+
+        """
+        opcodes = frozenset(pkt[1] | (pkt[2] << 8) for pkt in pkts)
+        # a submitted future would take the response meant for this send
+        with self._futures_lock:
+            busy = opcodes.intersection(self._pending_futures)
+            if busy:
+                raise RuntimeError(
+                    f"Command 0x{min(busy):04X} is awaiting a submitted response."
+                )
+            self._sync_opcodes = opcodes
+
+        # the read thread appends under the same condition
+        with self._pkt_cond:
+            self._event_packets.clear()
+        # a lone command is written as serialized, without a joined copy
+        self.port.write(pkts[0] if len(pkts) == 1 else b"".join(pkts))
+
+        if self.logger.isEnabledFor(logging.INFO):
+            for pkt in pkts:
+                self.logger.info(
+                    "%s  %s>%s", datetime.datetime.now(), self.id_tag, pkt.hex()
+                )
 
-        self.port.flush()
-        self.port.write(pkt)
+    def _retrieve_response(self, timeout: Optional[float]) -> EventPacket:
+        """Retrieves a command response, retrying on timeout.
+
+        PRIVATE
 
-        self.logger.info("%s  %s>%s", datetime.datetime.now(), self.id_tag, pkt.hex())
+        """
+        tries = self.retries
+        timeout_err = None
 
         while tries >= 0 and self._read_thread.is_alive():
             try:
-                return self._retrieve(timeout)
+                evt = self._retrieve(timeout)
+                self._cmd_credits = max(evt.evt_params[0], 1)
+                return evt
 
             except TimeoutError as err:
                 tries -= 1
@@ -51,8 +51,9 @@
 ##############################################################################
 """Contains full HCI implementation."""
 # pylint: disable=too-many-arguments
+import asyncio
 import logging
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 from ._hci_logger import get_formatted_logger
 from ._transport import SerialUartTransport
@@ -61,10 +62,19 @@ from .constants import ADI_PORT_BAUD_RATE
 from .data_params import AdvParams, ConnParams
 from .hci_packets import AsyncPacket, CommandPacket, EventPacket
 from .packet_codes import StatusCode
+from .packet_defs import OCF, OGF
 from .vendor_spec_cmds import VendorSpecificCmds
 from .ad_types import ADTypes
 from .utils import convert_str_address
 
+_RESET_CONN_STATS_CMD = CommandPacket(OGF.VENDOR_SPEC, OCF.VENDOR_SPEC.RESET_CONN_STATS)
+_SET_DEF_PHY_CMD = CommandPacket(
+    OGF.LE_CONTROLLER, OCF.LE_CONTROLLER.SET_DEF_PHY, params=b"\x00\x07\x07"
+)
+_ADV_ENABLE_CMD = CommandPacket(
+    OGF.LE_CONTROLLER, OCF.LE_CONTROLLER.SET_ADV_ENABLE, params=b"\x01"
+)
+
 
 class BleHci(BleStandardCmds, VendorSpecificCmds):
     """Host-controller interface.
@@ -150,7 +160,14 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
             flowcontrol,
             recover_on_power_loss,
         )
-        super().__init__(self.port, logger_name)
+        BleStandardCmds.__init__(self, self.port, logger_name)
+        VendorSpecificCmds.__init__(self, self.port, logger_name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.exit()
 
     def get_log_level(self) -> str:
         """Retrieve the current log level.
@@ -164,18 +181,10 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
             The current logging level.
 
         """
-        level = self.logger.level
-        if level == logging.DEBUG:
-            return "DEBUG"
-        if level == logging.INFO:
-            return "INFO"
-        if level == logging.WARNING:
-            return "WARNING"
-        if level == logging.ERROR:
-            return "ERROR"
-        if level == logging.CRITICAL:
-            return "CRITICAL"
-        return "NOTSET"
+        name = logging.getLevelName(self.logger.level)
+        if name.startswith("Level "):
+            return "NOTSET"
+        return name
 
     def set_log_level(self, level: Union[str, int]) -> None:
         """Sets log level.
@@ -193,25 +202,20 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
 
         """
         if isinstance(level, int):
-            self.logger.setLevel(level)
-            return
-
-        ll_str = level.upper()
-        if ll_str == "DEBUG":
-            self.logger.setLevel(logging.DEBUG)
-        elif ll_str == "INFO":
-            self.logger.setLevel(logging.INFO)
-        elif ll_str == "WARNING":
-            self.logger.setLevel(logging.WARNING)
-        elif ll_str == "ERROR":
-            self.logger.setLevel(logging.ERROR)
-        elif ll_str == "CRITICAL":
-            self.logger.setLevel(logging.CRITICAL)
+            log_level = level
         else:
-            self.logger.setLevel(logging.NOTSET)
-            self.logger.warning(
-                "Invalid log level string: %s, level set to 'logging.NOTSET'", ll_str
-            )
+            ll_str = level.upper()
+            log_level = logging.getLevelName(ll_str)
+            if not isinstance(log_level, int):
+                log_level = logging.NOTSET
+                self.logger.warning(
+                    "Invalid log level string: %s, level set to 'logging.NOTSET'",
+                    ll_str,
+                )
+
+        # setLevel clears the logging cache under the module lock
+        if self.logger.level != log_level:
+            self.logger.setLevel(log_level)
 
     def set_local_adv_name(self, adv_name: str, complete=True) -> StatusCode:
         """_summary_
@@ -234,21 +238,7 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
         ValueError
             If advertising name is empty
         """
-        if adv_name == "":
-            raise ValueError("Name cannot be an empty string")
-
-        ad_type = (
-            ADTypes.LOCAL_NAME_COMPLETE.value
-            if complete
-            else ADTypes.LOCAL_NAME_SHORT.value
-        )
-
-        data = [len(adv_name) + 1, ad_type]
-
-        for char in adv_name:
-            data.append(ord(char))
-
-        return self.set_adv_data(data)
+        return self.set_adv_data(self._local_adv_name_data(adv_name, complete))
 
     def start_advertising(
         self, connect: bool = True, adv_params: Optional[AdvParams] = None, adv_name=""
@@ -281,36 +271,25 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
 
         """
 
-        status = self.reset_connection_stats()
-
-        if status != StatusCode.SUCCESS:
-            self.logger.warning("Failed to reset connection stats")
-
-        status = self.set_default_phy(all_phys=0, tx_phys=7, rx_phys=7)
-        if status != StatusCode.SUCCESS:
-            self.logger.warning("Failed to set default PHY")
-
         if adv_params is None:
             adv_type = 0 if connect else 3
             adv_params = AdvParams(adv_type=adv_type)
 
-        status = self.set_adv_params(adv_params)
-
-        if status != StatusCode.SUCCESS:
-            self.logger.warning("Failed to set advertising parameters")
+        cmds, warnings = self._session_preamble()
+        cmds.append(self._build_adv_params_cmd(adv_params))
+        warnings.append("Failed to set advertising parameters")
 
         if adv_name != "":
-            status = self.set_local_adv_name(adv_name)
-            if status != StatusCode.SUCCESS:
-                self.logger.warning("Failed to set advertising name")
+            cmds.append(self._build_adv_data_cmd(self._local_adv_name_data(adv_name)))
+            warnings.append("Failed to set advertising name")
 
-        status = self.enable_adv(True)
+        cmds.append(_ADV_ENABLE_CMD)
 
-        return status
+        return self._write_session_commands(cmds, warnings)
 
     def init_connection(
         self,
-        addr: Optional[Union[str, int]] = None,
+        addr: Optional[Union[str, int, List[int], bytes]] = None,
         interval: int = 0x6,
         sup_timeout: int = 0x64,
         conn_params: Optional[ConnParams] = None,
@@ -329,8 +308,9 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
 
         Parameters
         ----------
-        addr : int
-            Peer device BD address.
+        addr : Union[str, int, List[int], bytes]
+            Peer device BD address. Given as an int, a
+            "00:11:22:33:44:55" string, or little-endian bytes.
         interval : int, optional
             Connection inverval.
         sup_timeout : int, optional
@@ -357,8 +337,10 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
                 )
             if isinstance(addr, str):
                 addr = convert_str_address(addr)
+            elif isinstance(addr, (list, bytes, bytearray)):
+                addr = int.from_bytes(bytes(addr), "little")
 
-            if max((addr.bit_length() + 7) // 8, 1) > 6:
+            if addr.bit_length() > 48:
                 raise ValueError(
                     f"Address ({addr}) is too large, must be 6 bytes or less."
                 )
@@ -370,10 +352,71 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
                 sup_timeout=sup_timeout,
             )
 
-        self.reset_connection_stats()
-        self.set_default_phy(all_phys=0, tx_phys=7, rx_phys=7)
+        cmds, warnings = self._session_preamble()
+        cmds.append(self._build_create_conn_cmd(conn_params))
+
+        return self._write_session_commands(cmds, warnings)
 
-        status = self.create_connection(conn_params)
+    def setup(
+        self,
+        reset: bool = True,
+        event_mask: Optional[int] = None,
+        event_mask_pg2: Optional[int] = None,
+        le_event_mask: Optional[int] = None,
+        default_phy: bool = False,
+    ) -> StatusCode:
+        """Reset and configure the controller.
+
+        Convenience function which optionally resets the DUT and
+        then sends the requested configuration commands pipelined,
+        so the whole configuration costs about one round trip
+        instead of one per command. The reset is sent on its own
+        so that no command reaches the controller mid-reset.
+
+        Parameters
+        ----------
+        reset : bool, optional
+            Reset the controller before configuring it?
+        event_mask : Optional[int], optional
+            Event mask to set, if any.
+        event_mask_pg2 : Optional[int], optional
+            Page 2 event mask to set, if any. Only sent along
+            with `event_mask`.
+        le_event_mask : Optional[int], optional
+            LE event mask to set, if any.
+        default_phy : bool, optional
+            Set the default PHY preferences to all PHYs?
+
+        Returns
+        -------
+        StatusCode
+            The status of the first command that failed, or
+            `StatusCode.SUCCESS` if all commands succeeded.
+
+        """
+        if reset:
+            status = self.reset()
+            if status != StatusCode.SUCCESS:
+                self.logger.warning("Failed to reset controller")
+                return status
+
+        cmds = []
+        if event_mask is not None:
+            cmds.extend(self._build_event_mask_cmds(event_mask, event_mask_pg2))
+        if le_event_mask is not None:
+            cmds.append(self._build_le_event_mask_cmd(le_event_mask))
+        if default_phy:
+            cmds.append(_SET_DEF_PHY_CMD)
+
+        status = StatusCode.SUCCESS
+        if not cmds:
+            return status
+
+        for cmd, evt in zip(cmds, self.write_commands(cmds)):
+            if evt.status != StatusCode.SUCCESS:
+                self.logger.warning("Setup command 0x%04X failed", cmd.opcode)
+                if status == StatusCode.SUCCESS:
+                    status = evt.status
 
         return status
 
@@ -399,19 +442,18 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
 
         """
         timeout_err = None
-        tries = self.retries
-        if not timeout:
+        if timeout is None:
             timeout = self.timeout
-        while tries >= 0:
+        for retries_left in range(self.retries, -1, -1):
             try:
-                return self.port.retrieve_packet(timeout=self.timeout)
+                return self.port.retrieve_packet(timeout=timeout)
             except TimeoutError as err:
-                tries -= 1
                 timeout_err = err
-                self.logger.warning(
-                    "Timeout occured. Retrying. %d retries remaining.",
-                    self.retries - tries,
-                )
+                if retries_left:
+                    self.logger.warning(
+                        "Timeout occured. Retrying. %d retries remaining.",
+                        retries_left,
+                    )
 
         raise TimeoutError("Timeout occured. No retries remaining.") from timeout_err
 
@@ -438,12 +480,86 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
             The command return packet.
 
         """
-        if not timeout:
+        if timeout is None:
             timeout = self.timeout
         evt = self.port.send_command(command, timeout=timeout)
 
         return evt
 
+    def write_commands(
+        self,
+        commands: List[CommandPacket],
+        timeout: Optional[float] = None,
+    ) -> List[EventPacket]:
+        """Write several commands to the controller pipelined.
+
+        Serializes the commands into a single write, as far as
+        the controller's command credits allow, and collects one
+        response per command. Responses are matched to commands
+        by opcode.
+
+        Parameters
+        ----------
+        commands : List[CommandPacket]
+            Commands to write, in order.
+        timeout : Optional[float], optional
+            Timeout for each response. Defaults to `self.timeout`.
+
+        Returns
+        -------
+        List[EventPacket]
+            The responses, in command order.
+
+        """
+        if timeout is None:
+            timeout = self.timeout
+        return self.port.send_commands(commands, timeout=timeout)
+
+    async def write_command_async(
+        self,
+        command: CommandPacket,
+        timeout: Optional[float] = None,
+    ) -> EventPacket:
+        """Write a command to the controller without blocking the event loop.
+
+        The command is written immediately and the response is
+        awaited, so several commands can be in flight at once,
+        e.g. via `asyncio.gather`. Responses are matched to
+        commands by opcode. A command that times out is withdrawn,
+        so its late response is not mistaken for a later one.
+
+        Commands are not held back for command credits. Keep the
+        number of commands in flight within the controller's
+        Num_HCI_Command_Packets, which is one unless the controller
+        has reported more. A blocking write of the same opcode must
+        not be in flight at the same time. The port write runs in
+        the loop's default executor.
+
+        Parameters
+        ----------
+        command : CommandPacket
+            Command to write.
+        timeout : Optional[float], optional
+            Timeout for the response. Defaults to `self.timeout`.
+
+        Returns
+        -------
+        EventPacket
+            The response to the command.
+
+        Raises
+        ------
+        RuntimeError
+            If a blocking write of the same opcode is awaiting
+            its response.
+
+        """
+        if timeout is None:
+            timeout = self.timeout
+        loop = asyncio.get_running_loop()
+        fut = await loop.run_in_executor(None, self.port.submit_command, command)
+        return await asyncio.wait_for(asyncio.wrap_future(fut), timeout)
+
     def write_command_raw(
         self,
         raw_command: bytearray,
@@ -454,7 +570,9 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
         Parameters
         ----------
         raw_command : bytearray
-            Command as bytearray
+            Command as bytearray. The command is written to the
+            port without being copied, so a mutable buffer must
+            not be modified until the call returns.
         timeout : int
             Timeout for read portion of the read/write.
             Can be used to temporarily override this object's
@@ -465,8 +583,7 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
         EventPacket
 
         """
-
-        if not timeout:
+        if timeout is None:
             timeout = self.timeout
         return self.port.send_command_raw(raw_command, timeout)
 
@@ -506,3 +623,52 @@ class BleHci(BleStandardCmds, VendorSpecificCmds):
             flowcontrol=flowcontrol,
             recover_on_power_loss=recover_on_power_loss,
         )
+
+    def _local_adv_name_data(self, adv_name: str, complete: bool = True) -> list:
+        """Builds the advertising data carrying the local name.
+
+        PRIVATE
+
+        """
+        if adv_name == "":
+            raise ValueError("Name cannot be an empty string")
+
+        ad_type = (
+            ADTypes.LOCAL_NAME_COMPLETE.value
+            if complete
+            else ADTypes.LOCAL_NAME_SHORT.value
+        )
+
+        data = [len(adv_name) + 1, ad_type]
+
+        for char in adv_name:
+            data.append(ord(char))
+
+        return data
+
+    def _session_preamble(self) -> Tuple[List[CommandPacket], List[str]]:
+        """Builds the commands shared by advertising and connection setup.
+
+        PRIVATE
+
+        """
+        cmds = [_RESET_CONN_STATS_CMD, _SET_DEF_PHY_CMD]
+        warnings = ["Failed to reset connection stats", "Failed to set default PHY"]
+
+        return cmds, warnings
+
+    def _write_session_commands(
+        self, cmds: List[CommandPacket], warnings: List[str]
+    ) -> StatusCode:
+        """Pipelines a session setup and returns the final command status.
+
+        PRIVATE
+
+        """
+        evts = self.write_commands(cmds)
+
+        for evt, warning in zip(evts, warnings):
+            if evt.status != StatusCode.SUCCESS:
+                self.logger.warning(warning)
+
+        return evts[-1].status
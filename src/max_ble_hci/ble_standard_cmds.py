@@ -53,16 +53,69 @@
 Module contains definitions for BLE standard HCI commands.
 """
 # pylint: disable=too-many-arguments
+import struct
+from functools import lru_cache
 from typing import List, Optional, Tuple, Union
 
 from ._hci_logger import get_formatted_logger
 from ._transport import SerialUartTransport
 from .constants import PayloadOption, PhyOption
 from .data_params import AdvParams, ConnParams, ScanParams
-from .hci_packets import CommandPacket, EventPacket
+from .hci_packets import CommandPacket, EventPacket, _command_header
 from .packet_codes import StatusCode
 from .packet_defs import OCF, OGF
-from .utils import to_le_nbyte_list, can_represent_as_bytes
+from .utils import can_represent_as_bytes
+
+# Opcode command fields of the standard commands sent by this module.
+_OCF_SET_DEF_PHY = OCF.LE_CONTROLLER.SET_DEF_PHY
+_OCF_SET_ADV_PARAM = OCF.LE_CONTROLLER.SET_ADV_PARAM
+_OCF_SET_ADV_ENABLE = OCF.LE_CONTROLLER.SET_ADV_ENABLE
+_OCF_SET_SCAN_ENABLE = OCF.LE_CONTROLLER.SET_SCAN_ENABLE
+_OCF_SET_SCAN_PARAM = OCF.LE_CONTROLLER.SET_SCAN_PARAM
+_OCF_CREATE_CONN = OCF.LE_CONTROLLER.CREATE_CONN
+_OCF_SET_DATA_LEN = OCF.LE_CONTROLLER.SET_DATA_LEN
+_OCF_SET_PHY = OCF.LE_CONTROLLER.SET_PHY
+_OCF_ENHANCED_TRANSMITTER_TEST = OCF.LE_CONTROLLER.ENHANCED_TRANSMITTER_TEST
+_OCF_ENHANCED_RECEIVER_TEST = OCF.LE_CONTROLLER.ENHANCED_RECEIVER_TEST
+_OCF_TEST_END = OCF.LE_CONTROLLER.TEST_END
+_OCF_SET_ADV_DATA = OCF.LE_CONTROLLER.SET_ADV_DATA
+_OCF_SET_SCAN_RESP_DATA = OCF.LE_CONTROLLER.SET_SCAN_RESP_DATA
+_OCF_SET_LE_EVENT_MASK = OCF.LE_CONTROLLER.SET_EVENT_MASK
+_OCF_DISCONNECT = OCF.LINK_CONTROL.DISCONNECT
+_OCF_RESET = OCF.CONTROLLER.RESET
+_OCF_SET_EVENT_MASK = OCF.CONTROLLER.SET_EVENT_MASK
+_OCF_SET_EVENT_MASK_PAGE2 = OCF.CONTROLLER.SET_EVENT_MASK_PAGE2
+
+# Packers for the fixed-layout command parameters, compiled once so each
+# payload is built in a single call.
+_PACK_SET_DEF_PHY = struct.Struct("<BBB").pack
+_PACK_SET_ADV_PARAM = struct.Struct("<HHBBB6sBB").pack
+_PACK_SET_SCAN_PARAM = struct.Struct("<BHHBB").pack
+_PACK_CREATE_CONN = struct.Struct("<HHBB6sBHHHHHH").pack
+_PACK_SET_DATA_LEN = struct.Struct("<HHH").pack
+_PACK_SET_PHY = struct.Struct("<HBBBH").pack
+_PACK_DISCONNECT = struct.Struct("<HB").pack
+_PACK_ENHANCED_TRANSMITTER_TEST = struct.Struct("<BBBB").pack
+_PACK_ENHANCED_RECEIVER_TEST = struct.Struct("<BBB").pack
+
+# Receiver test PHY codes by option. A receiver test on the coded PHY
+# covers both coding schemes, so S2 is sent as the coded S8 value.
+_RX_TEST_PHY = {
+    PhyOption.PHY_1M: PhyOption.PHY_1M.value,
+    PhyOption.PHY_2M: PhyOption.PHY_2M.value,
+    PhyOption.PHY_CODED_S8: PhyOption.PHY_CODED_S8.value,
+    PhyOption.PHY_CODED_S2: PhyOption.PHY_CODED_S8.value,
+}
+
+
+@lru_cache(maxsize=None)
+def _command_no_params(ogf: OGF, ocf: OCF) -> bytes:
+    """Get the serialized form of a parameterless command.
+
+    PRIVATE
+
+    """
+    return _command_header(CommandPacket.make_hci_opcode(ogf, ocf)) + b"\x00"
 
 
 class BleStandardCmds:
@@ -93,7 +146,10 @@ class BleStandardCmds:
         self.logger = get_formatted_logger(name=logger_name)
 
     def send_le_controller_command(
-        self, ocf: OCF, params: List[int] = None, return_evt: bool = False
+        self,
+        ocf: OCF,
+        params: Union[List[int], bytes] = None,
+        return_evt: bool = False,
     ) -> Union[StatusCode, EventPacket]:
         """Send an LE Controller command to the test board.
 
@@ -103,8 +159,9 @@ class BleStandardCmds:
         ----------
         ocf : OCF
             Opcode command field value for the desired HCI command.
-        params : List[int], optional
-            Command parameters as single-byte values.
+        params : Union[List[int], bytes], optional
+            Command parameters as single-byte values or as
+            already serialized bytes.
         return_evt : bool, optional
             If true, function returns full `EventPacket` object. If
             false, function returns only the status code.
@@ -118,14 +175,13 @@ class BleStandardCmds:
 
 
         """
-        cmd = CommandPacket(OGF.LE_CONTROLLER, ocf, params=params)
-        if return_evt:
-            return self.port.send_command(cmd)
-
-        return self.port.send_command(cmd).status
+        return self._send_command(OGF.LE_CONTROLLER, ocf, params, return_evt)
 
     def send_link_control_command(
-        self, ocf: OCF, params: List[int] = None, return_evt: bool = False
+        self,
+        ocf: OCF,
+        params: Union[List[int], bytes] = None,
+        return_evt: bool = False,
     ) -> Union[StatusCode, EventPacket]:
         """Send a Link Control command to the test board.
 
@@ -135,8 +191,9 @@ class BleStandardCmds:
         ----------
         ocf : OCF
             Opcode command field value for the desired HCI command.
-        params : List[int], optional
-            Command parameters as single-byte values.
+        params : Union[List[int], bytes], optional
+            Command parameters as single-byte values or as
+            already serialized bytes.
         return_evt : bool, optional
             If true, function returns full `EventPacket` object. If
             false, function returns only the status code.
@@ -150,14 +207,13 @@ class BleStandardCmds:
 
 
         """
-        cmd = CommandPacket(OGF.LINK_CONTROL, ocf, params=params)
-        if return_evt:
-            return self.port.send_command(cmd)
-
-        return self.port.send_command(cmd).status
+        return self._send_command(OGF.LINK_CONTROL, ocf, params, return_evt)
 
     def send_controller_command(
-        self, ocf: OCF, params: List[int] = None, return_evt: bool = False
+        self,
+        ocf: OCF,
+        params: Union[List[int], bytes] = None,
+        return_evt: bool = False,
     ) -> Union[StatusCode, EventPacket]:
         """Send a Controller command to the test board.
 
@@ -167,8 +223,9 @@ class BleStandardCmds:
         ----------
         ocf : OCF
             Opcode command field value for the desired HCI command.
-        params : List[int], optional
-            Command parameters as single-byte values.
+        params : Union[List[int], bytes], optional
+            Command parameters as single-byte values or as
+            already serialized bytes.
         return_evt : bool, optional
             If true, function returns full `EventPacket` object. If
             false, function returns only the status code.
@@ -182,11 +239,7 @@ class BleStandardCmds:
 
 
         """
-        cmd = CommandPacket(OGF.CONTROLLER, ocf, params=params)
-        if return_evt:
-            return self.port.send_command(cmd)
-
-        return self.port.send_command(cmd).status
+        return self._send_command(OGF.CONTROLLER, ocf, params, return_evt)
 
     def set_adv_data(self, data: list) -> StatusCode:
         """Set advertising data
@@ -206,13 +259,7 @@ class BleStandardCmds:
         ValueError
             If advertising data cannot be represented in 31 octets or less
         """
-        if not can_represent_as_bytes(data) or len(data) > 31:
-            raise ValueError("Advertising data length can be up to 31 octets")
-
-        params = [len(data)] + data
-        return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.SET_ADV_DATA, params=params
-        )
+        return self.port.send_command(self._build_adv_data_cmd(data)).status
 
     def set_scan_resp_data(self, data: list) -> StatusCode:
         """Set advertising data
@@ -236,9 +283,7 @@ class BleStandardCmds:
             raise ValueError("Advertising data length can be up to 31 octets")
 
         params = [len(data)] + data
-        return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.SET_SCAN_RESP_DATA, params=params
-        )
+        return self.send_le_controller_command(_OCF_SET_SCAN_RESP_DATA, params=params)
 
     def set_adv_params(self, adv_params: AdvParams = AdvParams()) -> StatusCode:
         """Set test board advertising parameters.
@@ -258,21 +303,7 @@ class BleStandardCmds:
             The return packet status code.
 
         """
-        params = to_le_nbyte_list(adv_params.interval_min, 2)
-        params.extend(to_le_nbyte_list(adv_params.interval_max, 2))
-        params.extend(
-            [
-                adv_params.adv_type,
-                adv_params.own_addr_type.value,
-                adv_params.peer_addr_type.value,
-            ]
-        )
-        params.extend(to_le_nbyte_list(adv_params.peer_addr, 6))
-        params.extend([adv_params.channel_map, adv_params.filter_policy])
-
-        return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.SET_ADV_PARAM, params=params
-        )
+        return self.port.send_command(self._build_adv_params_cmd(adv_params)).status
 
     def enable_adv(self, enable: bool) -> StatusCode:
         """Command board to start/stop advertising.
@@ -292,7 +323,7 @@ class BleStandardCmds:
 
         """
         return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.SET_ADV_ENABLE, params=int(enable)
+            _OCF_SET_ADV_ENABLE, params=bytes((enable,))
         )
 
     def set_scan_params(self, scan_params: ScanParams = ScanParams()) -> StatusCode:
@@ -312,16 +343,16 @@ class BleStandardCmds:
             The return packet status code.
 
         """
-        params = [scan_params.scan_type]
-        params.extend(to_le_nbyte_list(scan_params.scan_interval, 2))
-        params.extend(to_le_nbyte_list(scan_params.scan_window, 2))
-        params.append(scan_params.addr_type.value)
-        params.append(scan_params.filter_policy)
-
-        return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.SET_SCAN_PARAM, params=params
+        params = _PACK_SET_SCAN_PARAM(
+            scan_params.scan_type,
+            scan_params.scan_interval,
+            scan_params.scan_window,
+            scan_params.addr_type.value,
+            scan_params.filter_policy,
         )
 
+        return self.send_le_controller_command(_OCF_SET_SCAN_PARAM, params=params)
+
     def enable_scanning(
         self, enable: bool, filter_duplicates: bool = False
     ) -> StatusCode:
@@ -343,10 +374,8 @@ class BleStandardCmds:
             The return packet status code.
 
         """
-        params = [int(enable), int(filter_duplicates)]
-        return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.SET_SCAN_ENABLE, params=params
-        )
+        params = bytes((enable, filter_duplicates))
+        return self.send_le_controller_command(_OCF_SET_SCAN_ENABLE, params=params)
 
     def create_connection(
         self, conn_params: ConnParams = ConnParams(0x0)
@@ -367,22 +396,7 @@ class BleStandardCmds:
             The return packet status code.
 
         """
-        params = to_le_nbyte_list(conn_params.scan_interval, 2)
-        params.extend(to_le_nbyte_list(conn_params.scan_window, 2))
-        params.append(conn_params.init_filter_policy)
-        params.append(conn_params.peer_addr_type.value)
-        params.extend(to_le_nbyte_list(conn_params.peer_addr, 6))
-        params.append(conn_params.own_addr_type.value)
-        params.extend(to_le_nbyte_list(conn_params.conn_interval_min, 2))
-        params.extend(to_le_nbyte_list(conn_params.conn_interval_max, 2))
-        params.extend(to_le_nbyte_list(conn_params.max_latency, 2))
-        params.extend(to_le_nbyte_list(conn_params.sup_timeout, 2))
-        params.extend(to_le_nbyte_list(conn_params.min_ce_length, 2))
-        params.extend(to_le_nbyte_list(conn_params.max_ce_length, 2))
-
-        return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.CREATE_CONN, params=params
-        )
+        return self.port.send_command(self._build_create_conn_cmd(conn_params)).status
 
     def set_default_phy(
         self, all_phys: int = 0x0, tx_phys: int = 0x7, rx_phys: int = 0x7
@@ -407,10 +421,8 @@ class BleStandardCmds:
             The return packet status code.
 
         """
-        params = [all_phys, tx_phys, rx_phys]
-        return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.SET_DEF_PHY, params=params
-        )
+        params = _PACK_SET_DEF_PHY(all_phys, tx_phys, rx_phys)
+        return self.send_le_controller_command(_OCF_SET_DEF_PHY, params=params)
 
     def set_data_len(
         self, handle: int = 0x0000, tx_octets: int = 0xFB00, tx_time: int = 0x9042
@@ -435,12 +447,8 @@ class BleStandardCmds:
             The return packet status code.
 
         """
-        params = to_le_nbyte_list(handle, 2)
-        params.extend(to_le_nbyte_list(tx_octets, 2))
-        params.extend(to_le_nbyte_list(tx_time, 2))
-        return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.SET_DATA_LEN, params=params
-        )
+        params = _PACK_SET_DATA_LEN(handle, tx_octets, tx_time)
+        return self.send_le_controller_command(_OCF_SET_DATA_LEN, params=params)
 
     def set_phy(
         self,
@@ -497,11 +505,9 @@ class BleStandardCmds:
             )
             phy_opts = 0x0
 
-        params = to_le_nbyte_list(handle, 2)
-        params.extend([all_phys, tx_phys, rx_phys])
-        params.extend(to_le_nbyte_list(phy_opts, 2))
+        params = _PACK_SET_PHY(handle, all_phys, tx_phys, rx_phys, phy_opts)
 
-        return self.send_le_controller_command(OCF.LE_CONTROLLER.SET_PHY, params=params)
+        return self.send_le_controller_command(_OCF_SET_PHY, params=params)
 
     def tx_test(
         self,
@@ -538,9 +544,9 @@ class BleStandardCmds:
         if isinstance(phy, PhyOption):
             phy = phy.value
 
-        params = [channel, packet_len, payload, phy]
+        params = _PACK_ENHANCED_TRANSMITTER_TEST(channel, packet_len, payload, phy)
         return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.ENHANCED_TRANSMITTER_TEST, params=params
+            _OCF_ENHANCED_TRANSMITTER_TEST, params=params
         )
 
     def rx_test(
@@ -571,15 +577,11 @@ class BleStandardCmds:
 
         """
 
-        if phy == PhyOption.PHY_CODED_S2:
-            phy = PhyOption.PHY_CODED_S8
-
-        if isinstance(phy, PhyOption):
-            phy = phy.value
-
-        params = [channel, phy, modulation_idx]
+        params = _PACK_ENHANCED_RECEIVER_TEST(
+            channel, _RX_TEST_PHY.get(phy, phy), modulation_idx
+        )
         return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.ENHANCED_RECEIVER_TEST, params=params
+            _OCF_ENHANCED_RECEIVER_TEST, params=params
         )
 
     def end_test(self) -> Tuple[int, StatusCode]:
@@ -597,9 +599,7 @@ class BleStandardCmds:
             ending a TX test, this value will be 0.
 
         """
-        evt = self.send_le_controller_command(
-            OCF.LE_CONTROLLER.TEST_END, return_evt=True
-        )
+        evt = self.send_le_controller_command(_OCF_TEST_END, return_evt=True)
         rx_ok = evt.get_return_params()
 
         return rx_ok, evt.status
@@ -623,11 +623,8 @@ class BleStandardCmds:
             The return packet status code.
 
         """
-        params = to_le_nbyte_list(handle, 2)
-        params.append(reason)
-        return self.send_link_control_command(
-            OCF.LINK_CONTROL.DISCONNECT, params=params
-        )
+        params = _PACK_DISCONNECT(handle, reason)
+        return self.send_link_control_command(_OCF_DISCONNECT, params=params)
 
     def reset(self) -> StatusCode:
         """Reset board controller/link layer.
@@ -643,7 +640,7 @@ class BleStandardCmds:
             The return packet status code.
 
         """
-        return self.send_controller_command(OCF.CONTROLLER.RESET)
+        return self.send_controller_command(_OCF_RESET)
 
     def set_event_mask(
         self, mask: int, mask_pg2: Optional[int] = None
@@ -675,21 +672,14 @@ class BleStandardCmds:
             command.
 
         """
-        params = to_le_nbyte_list(mask, 8)
-        status = self.send_controller_command(
-            OCF.CONTROLLER.SET_EVENT_MASK, params=params
-        )
+        cmds = self._build_event_mask_cmds(mask, mask_pg2)
+        if len(cmds) == 1:
+            return self.port.send_command(cmds[0]).status
 
-        if mask_pg2:
-            params = to_le_nbyte_list(mask_pg2, 8)
-            return (
-                status,
-                self.send_controller_command(
-                    OCF.CONTROLLER.SET_EVENT_MASK_PAGE2, params=params
-                ),
-            )
+        # both pages go out in a single port write
+        evts = self.port.send_commands(cmds)
 
-        return status
+        return evts[0].status, evts[1].status
 
     def set_event_mask_le(self, mask: int) -> StatusCode:
         """Enable/disable LE events the board can generate.
@@ -711,7 +701,118 @@ class BleStandardCmds:
             The return packet status code.
 
         """
-        params = to_le_nbyte_list(mask, 8)
-        return self.send_le_controller_command(
-            OCF.LE_CONTROLLER.SET_EVENT_MASK, params=params
+        return self.port.send_command(self._build_le_event_mask_cmd(mask)).status
+
+    def _build_event_mask_cmds(
+        self, mask: int, mask_pg2: Optional[int] = None
+    ) -> List[CommandPacket]:
+        """Builds the set event mask commands, page 2 only if given.
+
+        PRIVATE
+
+        """
+        cmds = [
+            CommandPacket(
+                OGF.CONTROLLER,
+                _OCF_SET_EVENT_MASK,
+                params=mask.to_bytes(8, "little"),
+            )
+        ]
+        if mask_pg2:
+            cmds.append(
+                CommandPacket(
+                    OGF.CONTROLLER,
+                    _OCF_SET_EVENT_MASK_PAGE2,
+                    params=mask_pg2.to_bytes(8, "little"),
+                )
+            )
+
+        return cmds
+
+    def _build_le_event_mask_cmd(self, mask: int) -> CommandPacket:
+        """Builds the set LE event mask command.
+
+        PRIVATE
+
+        """
+        return CommandPacket(
+            OGF.LE_CONTROLLER,
+            _OCF_SET_LE_EVENT_MASK,
+            params=mask.to_bytes(8, "little"),
+        )
+
+    def _build_adv_data_cmd(self, data: list) -> CommandPacket:
+        """Builds the set advertising data command.
+
+        PRIVATE
+
+        """
+        if not can_represent_as_bytes(data) or len(data) > 31:
+            raise ValueError("Advertising data length can be up to 31 octets")
+
+        params = [len(data)] + data
+        return CommandPacket(OGF.LE_CONTROLLER, _OCF_SET_ADV_DATA, params=params)
+
+    def _build_adv_params_cmd(self, adv_params: AdvParams) -> CommandPacket:
+        """Builds the set advertising parameters command.
+
+        PRIVATE
+
+        """
+        params = _PACK_SET_ADV_PARAM(
+            adv_params.interval_min,
+            adv_params.interval_max,
+            adv_params.adv_type,
+            adv_params.own_addr_type.value,
+            adv_params.peer_addr_type.value,
+            adv_params.peer_addr.to_bytes(6, "little"),
+            adv_params.channel_map,
+            adv_params.filter_policy,
+        )
+
+        return CommandPacket(OGF.LE_CONTROLLER, _OCF_SET_ADV_PARAM, params=params)
+
+    def _build_create_conn_cmd(self, conn_params: ConnParams) -> CommandPacket:
+        """Builds the create connection command.
+
+        PRIVATE
+
+        """
+        params = _PACK_CREATE_CONN(
+            conn_params.scan_interval,
+            conn_params.scan_window,
+            conn_params.init_filter_policy,
+            conn_params.peer_addr_type.value,
+            conn_params.peer_addr.to_bytes(6, "little"),
+            conn_params.own_addr_type.value,
+            conn_params.conn_interval_min,
+            conn_params.conn_interval_max,
+            conn_params.max_latency,
+            conn_params.sup_timeout,
+            conn_params.min_ce_length,
+            conn_params.max_ce_length,
         )
+
+        return CommandPacket(OGF.LE_CONTROLLER, _OCF_CREATE_CONN, params=params)
+
+    def _send_command(
+        self,
+        ogf: OGF,
+        ocf: OCF,
+        params: Optional[Union[List[int], bytes]],
+        return_evt: bool,
+    ) -> Union[StatusCode, EventPacket]:
+        """Send a standard command, reusing cached parameterless frames.
+
+        PRIVATE
+
+        """
+        if params is None:
+            evt = self.port.send_command_raw(_command_no_params(ogf, ocf))
+        else:
+            evt = self.port.send_command(CommandPacket(ogf, ocf, params=params))
+
+        if return_evt:
+            return evt
+
+        return evt.status
@@ -53,8 +53,10 @@
 # pylint: disable=too-many-arguments
 from __future__ import annotations
 
+import struct
 import warnings
 from enum import Enum
+from functools import lru_cache
 from typing import List, Optional, Union
 
 from .constants import Endian
@@ -71,6 +73,37 @@ def byte_length(num: int):
     return max((num.bit_length() + 7) // 8, 1)
 
 
+# struct format codes of the unsigned integer sizes struct can unpack
+_UNSIGNED_CODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+@lru_cache(maxsize=None)
+def _command_header(opcode: int) -> bytes:
+    """Get the serialized packet type and opcode of a command.
+
+    PRIVATE
+
+    """
+    return bytes((PacketType.COMMAND.value, opcode & 0xFF, (opcode & 0xFF00) >> 8))
+
+
+@lru_cache(maxsize=None)
+def _return_params_struct(
+    param_lens: tuple, endianness: Endian
+) -> Optional[struct.Struct]:
+    """Compile return parameter lengths into a struct, if expressible.
+
+    PRIVATE
+
+    """
+    try:
+        codes = "".join(_UNSIGNED_CODES[p_len] for p_len in param_lens)
+    except KeyError:
+        return None
+
+    return struct.Struct(("<" if endianness is Endian.LITTLE else ">") + codes)
+
+
 class CommandPacket:
     """Serializer for HCI command packets.
 
@@ -89,8 +122,9 @@ class CommandPacket:
         Opcode group field.
     ocf : Union[OCF, int]
         Opcode command field.
-    params : Union[List[int], int], optional
-        Command parameters, if any.
+    params : Union[List[int], int, bytes], optional
+        Command parameters, if any. Parameters given as `bytes`
+        or `bytearray` are used as the serialized payload as-is.
 
     Attributes
     ----------
@@ -102,7 +136,7 @@ class CommandPacket:
         Total length of command parameters.
     opcode : int
         Command opcode.
-    params : Union[List[int], int], optional
+    params : Union[List[int], int, bytes], optional
         Command parameters, if any.
 
     """
@@ -111,16 +145,16 @@ class CommandPacket:
         self,
         ogf: Union[OGF, int],
         ocf: Union[OCF, int],
-        params: Optional[Union[List[int], int]] = None,
+        params: Optional[Union[List[int], int, bytes]] = None,
     ):
         self.ogf = self._enum_to_int(ogf)
         self.ocf = self._enum_to_int(ocf)
         self.length = self._get_length(params)
         self.opcode = CommandPacket.make_hci_opcode(self.ogf, self.ocf)
-        if params is not None:
-            self.params = params if isinstance(params, list) else [params]
+        if params is None or isinstance(params, (list, bytes, bytearray)):
+            self.params = params
         else:
-            self.params = None
+            self.params = [params]
 
     def __repr__(self) -> str:
         return str(self.__dict__)
@@ -145,6 +179,10 @@ class CommandPacket:
             return 0
         if isinstance(params, int):
             return byte_length(params)
+        if isinstance(params, (bytes, bytearray)):
+            return len(params)
+        if params and min(params) >= 0 and max(params) <= 0xFF:
+            return len(params)
 
         return sum(byte_length(x) for x in params)
 
@@ -203,22 +241,27 @@ class CommandPacket:
             The serialized command.
 
         """
-        serialized_cmd = bytearray()
-        serialized_cmd.append(PacketType.COMMAND.value)
-        serialized_cmd.append(self.opcode & 0xFF)
-        serialized_cmd.append((self.opcode & 0xFF00) >> 8)
-
+        serialized_cmd = bytearray(_command_header(self.opcode))
         serialized_cmd.append(self.length)
 
-        if self.params is not None:
+        if isinstance(self.params, (bytes, bytearray)):
+            serialized_cmd += self.params
+        elif self.params is not None:
+            try:
+                # single-byte parameters, the common case, pack in one call
+                serialized_cmd += bytes(self.params)
+                return serialized_cmd
+            except ValueError:
+                pass
+
+            extend = serialized_cmd.extend
+            byteorder = endianness.value
             for param in self.params:
                 num_bytes = byte_length(param)
                 try:
-                    serialized_cmd.extend(param.to_bytes(num_bytes, endianness.value))
+                    extend(param.to_bytes(num_bytes, byteorder))
                 except OverflowError:
-                    serialized_cmd.extend(
-                        param.to_bytes(num_bytes, endianness.value, signed=True)
-                    )
+                    extend(param.to_bytes(num_bytes, byteorder, signed=True))
 
         return serialized_cmd
 
@@ -363,14 +406,14 @@ class ExtendedPacket:
         serialized_cmd.append((self.length & 0xFF00) >> 8)
 
         if self.payload is not None:
+            extend = serialized_cmd.extend
+            byteorder = endianness.value
             for param in self.payload:
                 num_bytes = byte_length(param)
                 try:
-                    serialized_cmd.extend(param.to_bytes(num_bytes, endianness.value))
+                    extend(param.to_bytes(num_bytes, byteorder))
                 except OverflowError:
-                    serialized_cmd.extend(
-                        param.to_bytes(num_bytes, endianness.value, signed=True)
-                    )
+                    extend(param.to_bytes(num_bytes, byteorder, signed=True))
 
         return serialized_cmd
 
@@ -534,7 +577,7 @@ class EventPacket:
             pkt = EventPacket(
                 evt_code=serialized_event[0],
                 length=serialized_event[1],
-                status=StatusCode(serialized_event[5]),
+                status=serialized_event[5],
                 evt_params=serialized_event[2:],
             )
 
@@ -590,6 +633,23 @@ class EventPacket:
             )
         return pkt
 
+    def get_return_bytes(self) -> bytes:
+        """Retrieve the raw packet return parameters.
+
+        Returns the unparsed return parameter bytes. For command
+        complete events, these are the bytes following the status.
+        For any other event, all event parameters are returned.
+
+        Returns
+        -------
+        bytes
+            The raw return parameters.
+
+        """
+        if self.evt_code == EventCode.COMMAND_COMPLETE:
+            return self.evt_params[4:]
+        return self.evt_params
+
     def get_return_params(
         self,
         param_lens: Optional[List[int]] = None,
@@ -619,9 +679,7 @@ class EventPacket:
             The parsed return parameter(s).
 
         """
-        # pylint: disable=possibly-used-before-assignment
-        if self.evt_code == EventCode.COMMAND_COMPLETE:
-            param_bytes = self.evt_params[4:]
+        param_bytes = self.get_return_bytes()
 
         if not param_lens:
             return int.from_bytes(param_bytes, endianness.value, signed=signed)
@@ -632,13 +690,19 @@ class EventPacket:
                 f"Expected={sum(param_lens)}, Actual={len(param_bytes)}"
             )
 
+        param_struct = _return_params_struct(tuple(param_lens), endianness)
+        if param_struct is not None:
+            return list(param_struct.unpack_from(param_bytes))
+
+        # slicing the view does not copy the parameter bytes
+        param_view = memoryview(param_bytes)
         return_params = []
+        append = return_params.append
+        from_bytes = int.from_bytes
+        byteorder = endianness.value
         p_idx = 0
         for p_len in param_lens:
-            return_params.append(
-                int.from_bytes(param_bytes[p_idx : p_idx + p_len], endianness.value)
-            )
+            append(from_bytes(param_view[p_idx : p_idx + p_len], byteorder))
             p_idx += p_len
-        # pylint: enable=possibly-used-before-assignment
 
         return return_params
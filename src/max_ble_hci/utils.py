@@ -171,11 +171,7 @@ def can_represent_as_bytes(data: List[int]) -> bool:
     bool
         True if all data is 1 byte or less
     """
-    for item in data:
-        if int(item) > 255:
-            return False
-
-    return True
+    return max(map(int, data), default=0) <= 255
 
 
 def convert_str_address(addr: str) -> int:
@@ -53,11 +53,15 @@
 Module contains definitions for ADI vendor-specific HCI commands.
 """
 # pylint: disable=too-many-lines, too-many-arguments, too-many-public-methods
+import logging
+import struct
+from functools import lru_cache, reduce
+from operator import or_
 from typing import Dict, List, Optional, Tuple, Union
 
 from ._hci_logger import get_formatted_logger
 from ._transport import SerialUartTransport
-from .constants import MAX_U32, MAX_U64, PayloadOption, PhyOption, PubKeyValidateMode
+from .constants import PayloadOption, PhyOption, PubKeyValidateMode
 from .data_params import (
     AdvPktStats,
     DataPktStats,
@@ -67,10 +71,303 @@ from .data_params import (
     ScanPktStats,
     TestReport,
 )
-from .hci_packets import CommandPacket, EventPacket, byte_length
+from .hci_packets import CommandPacket, EventPacket, _command_header
 from .packet_codes import StatusCode
 from .packet_defs import OCF, OGF
-from .utils import to_le_nbyte_list, convert_str_address
+from .utils import convert_str_address
+
+# Opcode command fields of the vendor-specific commands.
+_OCF_SET_BD_ADDR = OCF.VENDOR_SPEC.SET_BD_ADDR
+_OCF_RESET_CONN_STATS = OCF.VENDOR_SPEC.RESET_CONN_STATS
+_OCF_GENERATE_ACL = OCF.VENDOR_SPEC.GENERATE_ACL
+_OCF_ENA_ACL_SINK = OCF.VENDOR_SPEC.ENA_ACL_SINK
+_OCF_TX_TEST = OCF.VENDOR_SPEC.TX_TEST
+_OCF_RX_TEST = OCF.VENDOR_SPEC.RX_TEST
+_OCF_ENA_AUTO_GEN_ACL = OCF.VENDOR_SPEC.ENA_AUTO_GEN_ACL
+_OCF_RESET_TEST_STATS = OCF.VENDOR_SPEC.RESET_TEST_STATS
+_OCF_SET_ADV_TX_PWR = OCF.VENDOR_SPEC.SET_ADV_TX_PWR
+_OCF_SET_CONN_TX_PWR = OCF.VENDOR_SPEC.SET_CONN_TX_PWR
+_OCF_SET_CHAN_MAP = OCF.VENDOR_SPEC.SET_CHAN_MAP
+_OCF_REG_READ = OCF.VENDOR_SPEC.REG_READ
+_OCF_SET_SCAN_CH_MAP = OCF.VENDOR_SPEC.SET_SCAN_CH_MAP
+_OCF_SET_EVENT_MASK = OCF.VENDOR_SPEC.SET_EVENT_MASK
+_OCF_SET_TX_TEST_ERR_PATT = OCF.VENDOR_SPEC.SET_TX_TEST_ERR_PATT
+_OCF_SET_CONN_OP_FLAGS = OCF.VENDOR_SPEC.SET_CONN_OP_FLAGS
+_OCF_SET_P256_PRIV_KEY = OCF.VENDOR_SPEC.SET_P256_PRIV_KEY
+_OCF_GET_PER_CHAN_MAP = OCF.VENDOR_SPEC.GET_PER_CHAN_MAP
+_OCF_GET_ACL_TEST_REPORT = OCF.VENDOR_SPEC.GET_ACL_TEST_REPORT
+_OCF_SET_LOCAL_MIN_USED_CHAN = OCF.VENDOR_SPEC.SET_LOCAL_MIN_USED_CHAN
+_OCF_GET_PEER_MIN_USED_CHAN = OCF.VENDOR_SPEC.GET_PEER_MIN_USED_CHAN
+_OCF_VALIDATE_PUB_KEY_MODE = OCF.VENDOR_SPEC.VALIDATE_PUB_KEY_MODE
+_OCF_GET_RAND_ADDR = OCF.VENDOR_SPEC.GET_RAND_ADDR
+_OCF_SET_LOCAL_FEAT = OCF.VENDOR_SPEC.SET_LOCAL_FEAT
+_OCF_SET_OP_FLAGS = OCF.VENDOR_SPEC.SET_OP_FLAGS
+_OCF_GET_PDU_FILT_STATS = OCF.VENDOR_SPEC.GET_PDU_FILT_STATS
+_OCF_SET_ENC_MODE = OCF.VENDOR_SPEC.SET_ENC_MODE
+_OCF_SET_DIAG_MODE = OCF.VENDOR_SPEC.SET_DIAG_MODE
+_OCF_SET_SNIFFER_ENABLE = OCF.VENDOR_SPEC.SET_SNIFFER_ENABLE
+_OCF_GET_SYS_STATS = OCF.VENDOR_SPEC.GET_SYS_STATS
+_OCF_GET_ADV_STATS = OCF.VENDOR_SPEC.GET_ADV_STATS
+_OCF_GET_SCAN_STATS = OCF.VENDOR_SPEC.GET_SCAN_STATS
+_OCF_GET_CONN_STATS = OCF.VENDOR_SPEC.GET_CONN_STATS
+_OCF_GET_TEST_STATS = OCF.VENDOR_SPEC.GET_TEST_STATS
+_OCF_GET_POOL_STATS = OCF.VENDOR_SPEC.GET_POOL_STATS
+_OCF_SET_AUX_DELAY = OCF.VENDOR_SPEC.SET_AUX_DELAY
+_OCF_SET_EXT_ADV_FRAG_LEN = OCF.VENDOR_SPEC.SET_EXT_ADV_FRAG_LEN
+_OCF_SET_EXT_ADV_PHY_OPTS = OCF.VENDOR_SPEC.SET_EXT_ADV_PHY_OPTS
+_OCF_SET_EXT_ADV_DEF_PHY_OPTS = OCF.VENDOR_SPEC.SET_EXT_ADV_DEF_PHY_OPTS
+_OCF_GENERATE_ISO = OCF.VENDOR_SPEC.GENERATE_ISO
+_OCF_GET_ISO_TEST_REPORT = OCF.VENDOR_SPEC.GET_ISO_TEST_REPORT
+_OCF_ENA_ISO_SINK = OCF.VENDOR_SPEC.ENA_ISO_SINK
+_OCF_ENA_AUTO_GEN_ISO = OCF.VENDOR_SPEC.ENA_AUTO_GEN_ISO
+_OCF_GET_AUX_ADV_STATS = OCF.VENDOR_SPEC.GET_AUX_ADV_STATS
+_OCF_GET_AUX_SCAN_STATS = OCF.VENDOR_SPEC.GET_AUX_SCAN_STATS
+_OCF_GET_PER_SCAN_STATS = OCF.VENDOR_SPEC.GET_PER_SCAN_STATS
+_OCF_SET_CONN_PHY_TX_PWR = OCF.VENDOR_SPEC.SET_CONN_PHY_TX_PWR
+_OCF_GET_RSSI = OCF.VENDOR_SPEC.GET_RSSI
+_OCF_RESET_ADV_STATS = OCF.VENDOR_SPEC.RESET_ADV_STATS
+_OCF_RESET_SCAN_STATS = OCF.VENDOR_SPEC.RESET_SCAN_STATS
+
+
+# DTM test parameter layouts, packed in place into per-instance buffers.
+_TX_TEST_VS_STRUCT = struct.Struct("<BBBBH")
+_RX_TEST_VS_STRUCT = struct.Struct("<BBBH")
+
+# Packers for the fixed-layout connection command parameters.
+_PACK_GENERATE_ACL = struct.Struct("<HHB").pack
+_PACK_SET_CONN_TX_PWR = struct.Struct("<Hb").pack
+_PACK_SET_CONN_OP_FLAGS = struct.Struct("<HIB").pack
+_PACK_GET_PER_CHAN_MAP = struct.Struct("<HB").pack
+_PACK_SET_ENC_MODE = struct.Struct("<BBH").pack
+_PACK_SET_CONN_PHY_TX_PWR = struct.Struct("<HbB").pack
+
+# Packers for the fixed-layout power and channel usage parameters.
+_PACK_SET_ADV_TX_PWR = struct.Struct("<b").pack
+_PACK_SET_LOCAL_MIN_USED_CHAN = struct.Struct("<BbB").pack
+
+# Packers for the fixed-layout extended advertising and ISO parameters.
+_PACK_SET_AUX_DELAY = struct.Struct("<IB").pack
+_PACK_SET_EXT_ADV_FRAG_LEN = struct.Struct("<BB").pack
+_PACK_SET_EXT_ADV_PHY_OPTS = struct.Struct("<BBB").pack
+_PACK_GENERATE_ISO = struct.Struct("<HHB").pack
+
+# Packer for the vendor-specific event mask and its enable flag.
+_PACK_SET_EVENT_MASK_VS = struct.Struct("<QB").pack
+
+# Channel map bits, advertising channels 37-39 are never part of a
+# connection channel map and are masked out.
+_CHAN_BITS = tuple(1 << chan for chan in range(40))
+_DATA_CHAN_MASK = 0x1FFFFFFFFF
+
+# Register dump line formats, indexed by the word's byte length.
+_REG_READ_FMTS = (
+    "",
+    "0x%08X: 0x______%02X",
+    "0x%08X: 0x____%04X",
+    "0x%08X: 0x__%06X",
+    "0x%08X: 0x%08X",
+)
+
+# Return layouts of the stats getters, as a precompiled struct matching the
+# wire format and the stats container fields in wire order.
+_TEST_REPORT_LAYOUT = (
+    struct.Struct("<4I"),
+    ("rx_pkt_count", "rx_oct_count", "gen_pkt_count", "gen_oct_count"),
+)
+_PDU_FILT_STATS_LAYOUT = (
+    struct.Struct("<19H"),
+    (
+        "fail_pdu",
+        "pass_pdu",
+        "fail_whitelist",
+        "pass_whitelist",
+        "fail_peer_addr_match",
+        "pass_peer_addr_match",
+        "fail_local_addr_match",
+        "pass_local_addr_match",
+        "fail_peer_rpa_verify",
+        "pass_peer_rpa_verify",
+        "fail_local_rpa_verify",
+        "pass_local_rpa_verify",
+        "fail_peer_priv_addr",
+        "fail_local_priv_addr",
+        "fail_peer_addr_res_req",
+        "pass_peer_addr_res_req",
+        "pass_local_addr_res_opt",
+        "peer_res_addr_pend",
+        "local_res_addr_pend",
+    ),
+)
+_MEM_STATS_LAYOUT = (
+    struct.Struct("<2H2I17H"),
+    (
+        "stack",
+        "sys_assert_cnt",
+        "free_mem",
+        "used_mem",
+        "max_connections",
+        "conn_ctx_size",
+        "cs_watermark_lvl",
+        "ll_watermark_lvl",
+        "sch_watermark_lvl",
+        "lhci_watermark_lvl",
+        "max_adv_sets",
+        "adv_set_ctx_size",
+        "ext_scan_max",
+        "ext_scan_ctx_size",
+        "max_num_ext_init",
+        "ext_init_ctx_size",
+        "max_per_scanners",
+        "per_scan_ctx_size",
+        "max_cig",
+        "cig_ctx_size",
+        "cis_ctx_size",
+    ),
+)
+_ADV_STATS_LAYOUT = (
+    struct.Struct("<6I4H"),
+    (
+        "tx_adv",
+        "rx_req",
+        "rx_req_crc",
+        "rx_req_timeout",
+        "tx_resp",
+        "err_adv",
+        "rx_setup",
+        "tx_setup",
+        "rx_isr",
+        "tx_isr",
+    ),
+)
+_SCAN_STATS_LAYOUT = (
+    struct.Struct("<8I4H"),
+    (
+        "rx_adv",
+        "rx_adv_crc",
+        "rx_adv_timeout",
+        "tx_req",
+        "rx_rsp",
+        "rx_rsp_crc",
+        "rx_rsp_timeout",
+        "err_scan",
+        "rx_setup",
+        "tx_setup",
+        "rx_isr",
+        "tx_isr",
+    ),
+)
+_DATA_STATS_LAYOUT = (
+    struct.Struct("<5I4H"),
+    (
+        "rx_data",
+        "rx_data_crc",
+        "rx_data_timeout",
+        "tx_data",
+        "err_data",
+        "rx_setup",
+        "tx_setup",
+        "rx_isr",
+        "tx_isr",
+    ),
+)
+_AUX_ADV_STATS_LAYOUT = (
+    struct.Struct("<3IH3I4H"),
+    (
+        "tx_adv",
+        "rx_req",
+        "rx_req_crc",
+        "rx_req_timeout",
+        "tx_resp",
+        "tx_chain",
+        "err_adv",
+        "rx_setup",
+        "tx_setup",
+        "rx_isr",
+        "tx_isr",
+    ),
+)
+_AUX_SCAN_STATS_LAYOUT = (
+    struct.Struct("<11I4H"),
+    (
+        "rx_adv",
+        "rx_adv_crc",
+        "rx_adv_timeout",
+        "tx_req",
+        "rx_rsp",
+        "rx_rsp_crc",
+        "rx_rsp_timeout",
+        "rx_chain",
+        "rx_chain_crc",
+        "rx_chain_timeout",
+        "err_scan",
+        "rx_setup",
+        "tx_setup",
+        "rx_isr",
+        "tx_isr",
+    ),
+)
+_PER_SCAN_STATS_LAYOUT = (
+    struct.Struct("<7I4H"),
+    (
+        "rx_adv",
+        "rx_adv_crc",
+        "rx_adv_timeout",
+        "rx_chain",
+        "rx_chain_crc",
+        "rx_chain_timeout",
+        "err_scan",
+        "rx_setup",
+        "tx_setup",
+        "rx_isr",
+        "tx_isr",
+    ),
+)
+
+# RSSI is returned as a single signed byte.
+_UNPACK_RSSI = struct.Struct("<b").unpack_from
+
+# Memory pool stats record: buffer size, number of buffers, number of
+# allocations, maximum allocations and maximum required length.
+_POOL_STATS_STRUCT = struct.Struct("<HBBBH")
+
+
+@lru_cache(maxsize=None)
+def _vs_command_header(ocf: OCF) -> bytes:
+    """Get the serialized packet type and opcode of a vendor-specific command.
+
+    PRIVATE
+
+    """
+    return _command_header(CommandPacket.make_hci_opcode(OGF.VENDOR_SPEC, ocf))
+
+
+@lru_cache(maxsize=None)
+def _vs_command_no_params(ocf: OCF) -> bytes:
+    """Get the serialized form of a parameterless vendor-specific command.
+
+    PRIVATE
+
+    """
+    return _vs_command_header(ocf) + b"\x00"
+
+
+def _parse_stats(
+    evt: EventPacket, layout: Tuple[struct.Struct, Tuple[str, ...]]
+) -> Dict[str, int]:
+    """Unpack stats return parameters into a field mapping.
+
+    PRIVATE
+
+    """
+    fmt, fields = layout
+    param_bytes = evt.get_return_bytes()
+    if fmt.size > len(param_bytes):
+        raise ValueError(
+            "Expected and actual number of return bytes do not match. "
+            f"Expected={fmt.size}, Actual={len(param_bytes)}"
+        )
+
+    return dict(zip(fields, fmt.unpack_from(param_bytes)))
 
 
 class VendorSpecificCmds:
@@ -100,8 +397,16 @@ class VendorSpecificCmds:
         self.port = port
         self.logger = get_formatted_logger(name=logger_name)
 
+        # reused by every DTM test command, safe because a command is
+        # serialized before its send call returns
+        self._tx_test_vs_buf = bytearray(_TX_TEST_VS_STRUCT.size)
+        self._rx_test_vs_buf = bytearray(_RX_TEST_VS_STRUCT.size)
+
     def send_vs_command(
-        self, ocf: OCF, params: List[int] = None, return_evt: bool = False
+        self,
+        ocf: OCF,
+        params: Union[List[int], bytes] = None,
+        return_evt: bool = False,
     ) -> Union[EventPacket, StatusCode]:
         """Send a vendor-specific command to the test board.
 
@@ -111,8 +416,9 @@ class VendorSpecificCmds:
         ----------
         ocf : OCF
             Opcode command field value for the desired HCI command.
-        params : List[int], optional
-            Command parameters as single-byte values.
+        params : Union[List[int], bytes], optional
+            Command parameters as single-byte values or as
+            already serialized bytes.
         return_evt : bool, optional
             If true, function returns full `EventPacket` object. If
             false, function returns only the status code.
@@ -126,11 +432,24 @@ class VendorSpecificCmds:
 
 
         """
-        cmd = CommandPacket(OGF.VENDOR_SPEC, ocf, params=params)
+        if params is None:
+            # getters and resets never change, their frames are cached
+            evt = self.port.send_command_raw(_vs_command_no_params(ocf))
+        elif isinstance(params, (bytes, bytearray)):
+            # serialized parameters need no packet object, the
+            # command is framed directly behind the cached header
+            evt = self.port.send_command_raw(
+                _vs_command_header(ocf) + bytes((len(params),)) + params
+            )
+        else:
+            evt = self.port.send_command(
+                CommandPacket(OGF.VENDOR_SPEC, ocf, params=params)
+            )
+
         if return_evt:
-            return self.port.send_command(cmd)
+            return evt
 
-        return self.port.send_command(cmd).status
+        return evt.status
 
     def set_address(self, addr: Union[int, str]) -> StatusCode:
         """Sets the BD address.
@@ -154,8 +473,8 @@ class VendorSpecificCmds:
         if isinstance(addr, str):
             addr = convert_str_address(addr)
 
-        params = to_le_nbyte_list(addr, 6)
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_BD_ADDR, params=params)
+        params = (addr & 0xFFFFFFFFFFFF).to_bytes(6, "little")
+        return self.send_vs_command(_OCF_SET_BD_ADDR, params=params)
 
     def reset_connection_stats(self) -> StatusCode:
         """Reset accumulated connection stats.
@@ -169,7 +488,7 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        return self.send_vs_command(OCF.VENDOR_SPEC.RESET_CONN_STATS)
+        return self.send_vs_command(_OCF_RESET_CONN_STATS)
 
     def enable_autogenerate_acl(self, enable: bool) -> StatusCode:
         """Enable/disable automatic generation of ACL packets.
@@ -189,9 +508,7 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        return self.send_vs_command(
-            OCF.VENDOR_SPEC.ENA_AUTO_GEN_ACL, params=int(enable)
-        )
+        return self.send_vs_command(_OCF_ENA_AUTO_GEN_ACL, params=bytes((enable,)))
 
     def generate_acl(
         self, handle: int, packet_len: int, num_packets: int
@@ -227,23 +544,21 @@ class VendorSpecificCmds:
             If `num_packets` is greater than 255.
 
         """
-        if byte_length(handle) > 2:
+        if handle >> 16:
             raise ValueError(
                 f"Handle ({handle}) is too large, must be 2 bytes or less."
             )
-        if num_packets > 0xFFFF:
+        if packet_len >> 16:
             raise ValueError(
-                f"Num packets too large ({num_packets}), must be 65535 or less."
+                f"Packet length too large ({packet_len}), must be 65535 or less."
             )
-        if packet_len > 0xFF:
+        if num_packets >> 8:
             raise ValueError(
-                f"Packet length too large ({packet_len}), must be 255 or less."
+                f"Num packets too large ({num_packets}), must be 255 or less."
             )
 
-        params = to_le_nbyte_list(handle, 2)
-        params.append(packet_len)
-        params.extend(to_le_nbyte_list(num_packets, 2))
-        return self.send_vs_command(OCF.VENDOR_SPEC.GENERATE_ACL, params=params)
+        params = _PACK_GENERATE_ACL(handle, packet_len, num_packets)
+        return self.send_vs_command(_OCF_GENERATE_ACL, params=params)
 
     def enable_acl_sink(self, enable: bool) -> StatusCode:
         """Enable/disable ACL sink.
@@ -262,8 +577,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        params = int(enable)
-        return self.send_vs_command(OCF.VENDOR_SPEC.ENA_ACL_SINK, params=params)
+        params = bytes((enable,))
+        return self.send_vs_command(_OCF_ENA_ACL_SINK, params=params)
 
     def tx_test_vs(
         self,
@@ -303,9 +618,9 @@ class VendorSpecificCmds:
         ValueError
             If `channel` is greater than 39 or less than 0.
         ValueError
-            If `packet_len` is greater than 255.
+            If `packet_len` is greater than 65535.
         ValueError
-            If `num_packets` is greater than 65535.
+            If `num_packets` is greater than 255.
 
         """
         if not 0 <= channel < 40:
@@ -323,10 +638,10 @@ class VendorSpecificCmds:
 
         payload = payload.value if isinstance(payload, PayloadOption) else payload
         phy = phy.value if isinstance(phy, PhyOption) else phy
-        params = [channel, packet_len, payload, phy]
-
-        params.extend(to_le_nbyte_list(num_packets, 2))
-        return self.send_vs_command(OCF.VENDOR_SPEC.TX_TEST, params=params)
+        _TX_TEST_VS_STRUCT.pack_into(
+            self._tx_test_vs_buf, 0, channel, packet_len, payload, phy, num_packets
+        )
+        return self.send_vs_command(_OCF_TX_TEST, params=self._tx_test_vs_buf)
 
     def rx_test_vs(
         self,
@@ -379,9 +694,10 @@ class VendorSpecificCmds:
         if isinstance(phy, PhyOption):
             phy = phy.value
 
-        params = [channel, phy, modulation_idx]
-        params.extend(to_le_nbyte_list(num_packets, 2))
-        return self.send_vs_command(OCF.VENDOR_SPEC.RX_TEST, params=params)
+        _RX_TEST_VS_STRUCT.pack_into(
+            self._rx_test_vs_buf, 0, channel, phy, modulation_idx, num_packets
+        )
+        return self.send_vs_command(_OCF_RX_TEST, params=self._rx_test_vs_buf)
 
     def reset_test_stats(self) -> StatusCode:
         """Reset accumulated test stats.
@@ -395,7 +711,7 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        return self.send_vs_command(OCF.VENDOR_SPEC.RESET_TEST_STATS)
+        return self.send_vs_command(_OCF_RESET_TEST_STATS)
 
     def set_adv_tx_power(self, tx_power: int) -> StatusCode:
         """Set the advertising TX power.
@@ -425,7 +741,8 @@ class VendorSpecificCmds:
                 f"TX power ({tx_power}) out of range, must be in range [-127, 127]."
             )
 
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_ADV_TX_PWR, params=tx_power)
+        params = _PACK_SET_ADV_TX_PWR(tx_power)
+        return self.send_vs_command(_OCF_SET_ADV_TX_PWR, params=params)
 
     def set_conn_tx_power(self, tx_power: int, handle: int = 0x0000) -> StatusCode:
         """Set the connection TX power.
@@ -454,7 +771,7 @@ class VendorSpecificCmds:
             If `tx_power` is greater than 127 or less than -127.
 
         """
-        if byte_length(handle) > 2:
+        if handle >> 16:
             raise ValueError(
                 f"Handle ({handle}) is too large, must be 2 bytes or less."
             )
@@ -463,9 +780,8 @@ class VendorSpecificCmds:
                 f"TX power ({tx_power}) out of range, must be in range [-127, 127]."
             )
 
-        params = to_le_nbyte_list(handle, 2)
-        params.append(tx_power)
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_CONN_TX_PWR, params=params)
+        params = _PACK_SET_CONN_TX_PWR(handle, tx_power)
+        return self.send_vs_command(_OCF_SET_CONN_TX_PWR, params=params)
 
     def set_channel_map(
         self,
@@ -496,27 +812,36 @@ class VendorSpecificCmds:
         ------
         ValueError
             If `handle` is more than 2 bytes in size.
+        ValueError
+            If a channel is less than 0 or greater than 39.
 
         """
-        if byte_length(handle) > 2:
+        if handle >> 16:
             raise ValueError(
                 f"Handle ({handle}) is too large, must be 2 bytes or less."
             )
 
-        if channels:
-            channels = channels if isinstance(channels, list) else [channels]
-            channel_mask = 0x0000000000
-            for chan in channels:
-                if chan in [37, 38, 39]:
-                    continue
-                channel_mask = channel_mask | (1 << chan)
+        if not channels:
+            channel_mask = _DATA_CHAN_MASK
+        elif isinstance(channels, list):
+            if min(channels) < 0 or max(channels) > 39:
+                bad_chan = next(chan for chan in channels if not 0 <= chan < 40)
+                raise ValueError(
+                    f"Channel out of bandwidth ({bad_chan}), must be in range [0, 40)."
+                )
+            channel_mask = (
+                reduce(or_, map(_CHAN_BITS.__getitem__, channels), 0) & _DATA_CHAN_MASK
+            )
         else:
-            channel_mask = 0x1FFFFFFFFF
+            if not 0 <= channels < 40:
+                raise ValueError(
+                    f"Channel out of bandwidth ({channels}), must be in range [0, 40)."
+                )
+            channel_mask = _CHAN_BITS[channels] & _DATA_CHAN_MASK
 
-        params = to_le_nbyte_list(handle, 2)
-        params.extend(to_le_nbyte_list(channel_mask, 5))
+        params = handle.to_bytes(2, "little") + channel_mask.to_bytes(5, "little")
 
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_CHAN_MAP, params=params)
+        return self.send_vs_command(_OCF_SET_CHAN_MAP, params=params)
 
     def read_register(
         self, addr: int, length: int, print_data: bool = False
@@ -544,29 +869,23 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        params = [length]
-        params.extend(to_le_nbyte_list(addr, 4))
-        evt = self.send_vs_command(
-            OCF.VENDOR_SPEC.REG_READ, params=params, return_evt=True
-        )
-
-        param_lens = [4] * (length // 4)
-        if not length % 4 == 0:
-            param_lens.append(length % 4)
+        params = bytearray((length,))
+        params += addr.to_bytes(4, "little")
+        evt = self.send_vs_command(_OCF_REG_READ, params=params, return_evt=True)
+
+        num_words, remainder = divmod(length, 4)
+        param_lens = [4] * num_words
+        if remainder:
+            param_lens.append(remainder)
         read_data = evt.get_return_params(param_lens=param_lens)
 
-        if print_data:
-            for idx, plen in enumerate(param_lens):
-                if plen == 1:
-                    self.logger.info("0x%08X: 0x______%02X", addr, read_data[idx])
-                elif plen == 2:
-                    self.logger.info("0x%08X: 0x____%04X", addr, read_data[idx])
-                elif plen == 3:
-                    self.logger.info("0x%08X: 0x__%06X", addr, read_data[idx])
-                else:
-                    self.logger.info("0x%08X: 0x%08X", addr, read_data[idx])
-
-                addr += 4
+        if print_data and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "\n".join(
+                    _REG_READ_FMTS[plen] % (addr + 4 * idx, data)
+                    for idx, (plen, data) in enumerate(zip(param_lens, read_data))
+                )
+            )
 
         return read_data, evt.status
 
@@ -588,7 +907,7 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_SCAN_CH_MAP, params=channel_map)
+        return self.send_vs_command(_OCF_SET_SCAN_CH_MAP, params=bytes((channel_map,)))
 
     def set_event_mask_vs(self, mask: int, enable: bool) -> StatusCode:
         """Enable/disable vendor specific events the board can generate.
@@ -613,9 +932,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        params = to_le_nbyte_list(mask, 8)
-        params.append(int(enable))
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_EVENT_MASK, params=params)
+        params = _PACK_SET_EVENT_MASK_VS(mask, enable)
+        return self.send_vs_command(_OCF_SET_EVENT_MASK, params=params)
 
     def set_tx_test_err_pattern(self, pattern: int) -> StatusCode:
         """Set the TX test mode error pattern.
@@ -641,11 +959,11 @@ class VendorSpecificCmds:
 
         """
 
-        if pattern > MAX_U32:
+        if pattern >> 32:
             raise ValueError(f"Pattern ({pattern}) too large, must be 32 bits or less.")
 
-        params = to_le_nbyte_list(pattern, 4)
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_TX_TEST_ERR_PATT, params=params)
+        params = pattern.to_bytes(4, "little")
+        return self.send_vs_command(_OCF_SET_TX_TEST_ERR_PATT, params=params)
 
     def set_connection_op_flags(
         self, handle: int, flags: int, enable: bool
@@ -681,19 +999,17 @@ class VendorSpecificCmds:
             If `flags` is larger than 4 bytes in size.
 
         """
-        if byte_length(handle) > 2:
+        if handle >> 16:
             raise ValueError(
                 f"Handle ({handle}) is too large, must be 2 bytes or less."
             )
-        if byte_length(flags) > 4:
+        if flags >> 32:
             raise ValueError(f"Flags ({flags}) is too large, must be 4 bytes or less.")
 
-        params = to_le_nbyte_list(handle, 2)
-        params.extend(to_le_nbyte_list(flags, 4))
-        params.append(int(enable))
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_CONN_OP_FLAGS, params=params)
+        params = _PACK_SET_CONN_OP_FLAGS(handle, flags, enable)
+        return self.send_vs_command(_OCF_SET_CONN_OP_FLAGS, params=params)
 
-    def set_256_priv_key(self, priv_key: List[int]) -> StatusCode:
+    def set_256_priv_key(self, priv_key: Union[List[int], int]) -> StatusCode:
         """Set/clear the P-256 private key.
 
         Sends a vendor-specific command to the DUT, telling it to
@@ -703,9 +1019,10 @@ class VendorSpecificCmds:
 
         Parameters
         ----------
-        priv_key : list
-            Desired P-256 private key. Setting to `0` will clear
-            the key.
+        priv_key : Union[List[int], int]
+            Desired P-256 private key, as a list of bytes with the
+            most significant byte first or as an integer. Setting
+            to `0` will clear the key.
 
         Returns
         -------
@@ -718,14 +1035,20 @@ class VendorSpecificCmds:
             If `priv_key` is larger than 32 bytes in size.
 
         """
-        if len(priv_key) > 32:
-            raise ValueError(
-                f"Private key ({priv_key}) too large, must be 32 bytes or less."
-            )
+        if isinstance(priv_key, int):
+            if priv_key >> 256:
+                raise ValueError(
+                    f"Private key ({priv_key}) too large, must be 32 bytes or less."
+                )
+            params = priv_key.to_bytes(32, "little")
+        else:
+            if len(priv_key) > 32:
+                raise ValueError(
+                    f"Private key ({priv_key}) too large, must be 32 bytes or less."
+                )
+            params = bytes(reversed(priv_key))
 
-        return self.send_vs_command(
-            OCF.VENDOR_SPEC.SET_P256_PRIV_KEY, params=priv_key[::-1]
-        )
+        return self.send_vs_command(_OCF_SET_P256_PRIV_KEY, params=params)
 
     def get_channel_map_periodic_scan_adv(
         self, handle: int, is_advertising: bool
@@ -756,15 +1079,14 @@ class VendorSpecificCmds:
             If `handle` is larger than 2 bytes in size.
 
         """
-        if byte_length(handle) > 2:
+        if handle >> 16:
             raise ValueError(
                 f"Handle ({handle}) is too large, must be 2 bytes or less."
             )
 
-        params = to_le_nbyte_list(handle, 2)
-        params.append(int(is_advertising))
+        params = _PACK_GET_PER_CHAN_MAP(handle, is_advertising)
         evt = self.send_vs_command(
-            OCF.VENDOR_SPEC.GET_PER_CHAN_MAP, params=params, return_evt=True
+            _OCF_GET_PER_CHAN_MAP, params=params, return_evt=True
         )
 
         return evt.get_return_params(), evt.status
@@ -783,15 +1105,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_ACL_TEST_REPORT, return_evt=True)
-        data = evt.get_return_params(param_lens=[4, 4, 4, 4])
-
-        stats = TestReport(
-            rx_pkt_count=data[0],
-            rx_oct_count=data[1],
-            gen_pkt_count=data[2],
-            gen_oct_count=data[3],
-        )
+        evt = self.send_vs_command(_OCF_GET_ACL_TEST_REPORT, return_evt=True)
+        stats = TestReport(**_parse_stats(evt, _TEST_REPORT_LAYOUT))
 
         return stats, evt.status
 
@@ -838,10 +1153,8 @@ class VendorSpecificCmds:
         if phy == PhyOption.PHY_CODED_S2:
             phy = PhyOption.PHY_CODED
 
-        params = [phy.value, pwr_thresh, min_used]
-        return self.send_vs_command(
-            OCF.VENDOR_SPEC.SET_LOCAL_MIN_USED_CHAN, params=params
-        )
+        params = _PACK_SET_LOCAL_MIN_USED_CHAN(phy.value, pwr_thresh, min_used)
+        return self.send_vs_command(_OCF_SET_LOCAL_MIN_USED_CHAN, params=params)
 
     def get_peer_min_num_channels_used(
         self, handle: int
@@ -870,14 +1183,14 @@ class VendorSpecificCmds:
             If `handle` is larger than 2 bytes in size.
 
         """
-        if byte_length(handle) > 2:
+        if handle >> 16:
             raise ValueError(
                 f"Handle ({handle}) is too large, must be 2 bytes or less."
             )
 
-        params = to_le_nbyte_list(handle, 2)
+        params = handle.to_bytes(2, "little")
         evt = self.send_vs_command(
-            OCF.VENDOR_SPEC.GET_PEER_MIN_USED_CHAN, params=params, return_evt=True
+            _OCF_GET_PEER_MIN_USED_CHAN, params=params, return_evt=True
         )
         data = evt.get_return_params(param_lens=[1, 1, 1])
 
@@ -908,7 +1221,7 @@ class VendorSpecificCmds:
 
         """
         return self.send_vs_command(
-            OCF.VENDOR_SPEC.VALIDATE_PUB_KEY_MODE, params=[mode.value]
+            _OCF_VALIDATE_PUB_KEY_MODE, params=bytes((mode.value,))
         )
 
     def get_rand_address(self) -> Tuple[int, StatusCode]:
@@ -925,7 +1238,7 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_RAND_ADDR, return_evt=True)
+        evt = self.send_vs_command(_OCF_GET_RAND_ADDR, return_evt=True)
 
         return evt.get_return_params(), evt.status
 
@@ -954,13 +1267,13 @@ class VendorSpecificCmds:
             If `features` is larger than 64 bits (8 bytes) in size.
 
         """
-        if features > MAX_U64:
+        if features >> 64:
             raise ValueError(
                 f"Feature mask ({features}) is too large, must be 64 bits or less."
             )
 
-        params = to_le_nbyte_list(features, 8)
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_LOCAL_FEAT, params=params)
+        params = features.to_bytes(8, "little")
+        return self.send_vs_command(_OCF_SET_LOCAL_FEAT, params=params)
 
     def set_operational_flags(self, flags: int, enable: bool) -> StatusCode:
         """Enable/disable operational flags.
@@ -990,12 +1303,11 @@ class VendorSpecificCmds:
             If `flags` is larger than 32 bits (4 bytes) in size.
 
         """
-        if flags > MAX_U32:
+        if flags >> 32:
             raise ValueError(f"Flags ({flags}) is too large, must be 32 bits or less.")
 
-        params = to_le_nbyte_list(flags, 4)
-        params.append(int(enable))
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_OP_FLAGS, params=params)
+        params = flags.to_bytes(4, "little") + bytes((enable,))
+        return self.send_vs_command(_OCF_SET_OP_FLAGS, params=params)
 
     def get_pdu_filter_stats(self) -> Tuple[PduPktStats, StatusCode]:
         """Get the accumulated PDU filter stats.
@@ -1011,30 +1323,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_PDU_FILT_STATS, return_evt=True)
-        data = evt.get_return_params(param_lens=[2] * 19)
-
-        stats = PduPktStats(
-            fail_pdu=data[0],
-            pass_pdu=data[1],
-            fail_whitelist=data[2],
-            pass_whitelist=data[3],
-            fail_peer_addr_match=data[4],
-            pass_peer_addr_match=data[5],
-            fail_local_addr_match=data[6],
-            pass_local_addr_match=data[7],
-            fail_peer_rpa_verify=data[8],
-            pass_peer_rpa_verify=data[9],
-            fail_local_rpa_verify=data[10],
-            pass_local_rpa_verify=data[11],
-            fail_peer_priv_addr=data[12],
-            fail_local_priv_addr=data[13],
-            fail_peer_addr_res_req=data[14],
-            pass_peer_addr_res_req=data[15],
-            pass_local_addr_res_opt=data[16],
-            peer_res_addr_pend=data[17],
-            local_res_addr_pend=data[18],
-        )
+        evt = self.send_vs_command(_OCF_GET_PDU_FILT_STATS, return_evt=True)
+        stats = PduPktStats(**_parse_stats(evt, _PDU_FILT_STATS_LAYOUT))
 
         return stats, evt.status
 
@@ -1067,15 +1357,13 @@ class VendorSpecificCmds:
             If `handle` is larger than 2 bytes in size.
 
         """
-        if byte_length(handle) > 2:
+        if handle >> 16:
             raise ValueError(
                 f"Handle ({handle}) is too large, must be 2 bytes or less."
             )
 
-        params = [int(enable)]
-        params.append(int(nonce_mode))
-        params.extend(to_le_nbyte_list(handle, 2))
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_ENC_MODE, params=params)
+        params = _PACK_SET_ENC_MODE(enable, nonce_mode, handle)
+        return self.send_vs_command(_OCF_SET_ENC_MODE, params=params)
 
     def set_diagnostic_mode(self, enable: bool) -> StatusCode:
         """Enable/disable diagnostic mode.
@@ -1095,7 +1383,7 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_DIAG_MODE, params=int(enable))
+        return self.send_vs_command(_OCF_SET_DIAG_MODE, params=bytes((enable,)))
 
     def enable_sniffer_packet_forwarding(self, enable: bool) -> StatusCode:
         """Enable/disable sniffer packet forwarding.
@@ -1116,8 +1404,8 @@ class VendorSpecificCmds:
 
         """
         out_method = 0  # HCI through tokens, only available option
-        params = [out_method, int(enable)]
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_SNIFFER_ENABLE, params=params)
+        params = bytes((out_method, enable))
+        return self.send_vs_command(_OCF_SET_SNIFFER_ENABLE, params=params)
 
     def get_memory_stats(self) -> Tuple[MemPktStats, StatusCode]:
         """Get memory and system stats.
@@ -1133,34 +1421,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_SYS_STATS, return_evt=True)
-        data = evt.get_return_params(
-            param_lens=[2, 2, 4, 4, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2]
-        )
-
-        stats = MemPktStats(
-            stack=data[0],
-            sys_assert_cnt=data[1],
-            free_mem=data[2],
-            used_mem=data[3],
-            max_connections=data[4],
-            conn_ctx_size=data[5],
-            cs_watermark_lvl=data[6],
-            ll_watermark_lvl=data[7],
-            sch_watermark_lvl=data[8],
-            lhci_watermark_lvl=data[9],
-            max_adv_sets=data[10],
-            adv_set_ctx_size=data[11],
-            ext_scan_max=data[12],
-            ext_scan_ctx_size=data[13],
-            max_num_ext_init=data[14],
-            ext_init_ctx_size=data[15],
-            max_per_scanners=data[16],
-            per_scan_ctx_size=data[17],
-            max_cig=data[18],
-            cig_ctx_size=data[19],
-            cis_ctx_size=data[20],
-        )
+        evt = self.send_vs_command(_OCF_GET_SYS_STATS, return_evt=True)
+        stats = MemPktStats(**_parse_stats(evt, _MEM_STATS_LAYOUT))
 
         return stats, evt.status
 
@@ -1178,21 +1440,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_ADV_STATS, return_evt=True)
-        data = evt.get_return_params(param_lens=[4, 4, 4, 4, 4, 4, 2, 2, 2, 2])
-
-        stats = AdvPktStats(
-            tx_adv=data[0],
-            rx_req=data[1],
-            rx_req_crc=data[2],
-            rx_req_timeout=data[3],
-            tx_resp=data[4],
-            err_adv=data[5],
-            rx_setup=data[6],
-            tx_setup=data[7],
-            rx_isr=data[8],
-            tx_isr=data[9],
-        )
+        evt = self.send_vs_command(_OCF_GET_ADV_STATS, return_evt=True)
+        stats = AdvPktStats(**_parse_stats(evt, _ADV_STATS_LAYOUT))
 
         return stats, evt.status
 
@@ -1204,23 +1453,8 @@ class VendorSpecificCmds:
         Tuple[ScanPktStats, StatusCode]
             Accumulated scanning stats and status code
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_SCAN_STATS, return_evt=True)
-        data = evt.get_return_params(param_lens=[4, 4, 4, 4, 4, 4, 4, 4, 2, 2, 2, 2])
-
-        stats = ScanPktStats(
-            rx_adv=data[0],
-            rx_adv_crc=data[1],
-            rx_adv_timeout=data[2],
-            tx_req=data[3],
-            rx_rsp=data[4],
-            rx_rsp_crc=data[5],
-            rx_rsp_timeout=data[6],
-            err_scan=data[7],
-            rx_setup=data[8],
-            tx_setup=data[9],
-            rx_isr=data[10],
-            tx_isr=data[11],
-        )
+        evt = self.send_vs_command(_OCF_GET_SCAN_STATS, return_evt=True)
+        stats = ScanPktStats(**_parse_stats(evt, _SCAN_STATS_LAYOUT))
 
         return stats, evt.status
 
@@ -1238,20 +1472,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_CONN_STATS, return_evt=True)
-        data = evt.get_return_params(param_lens=[4, 4, 4, 4, 4, 2, 2, 2, 2])
-
-        stats = DataPktStats(
-            rx_data=data[0],
-            rx_data_crc=data[1],
-            rx_data_timeout=data[2],
-            tx_data=data[3],
-            err_data=data[4],
-            rx_setup=data[5],
-            tx_setup=data[6],
-            rx_isr=data[7],
-            tx_isr=data[8],
-        )
+        evt = self.send_vs_command(_OCF_GET_CONN_STATS, return_evt=True)
+        stats = DataPktStats(**_parse_stats(evt, _DATA_STATS_LAYOUT))
 
         return stats, evt.status
 
@@ -1269,20 +1491,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_TEST_STATS, return_evt=True)
-        data = evt.get_return_params(param_lens=[4, 4, 4, 4, 4, 2, 2, 2, 2])
-
-        stats = DataPktStats(
-            rx_data=data[0],
-            rx_data_crc=data[1],
-            rx_data_timeout=data[2],
-            tx_data=data[3],
-            err_data=data[4],
-            rx_setup=data[5],
-            tx_setup=data[6],
-            rx_isr=data[7],
-            tx_isr=data[8],
-        )
+        evt = self.send_vs_command(_OCF_GET_TEST_STATS, return_evt=True)
+        stats = DataPktStats(**_parse_stats(evt, _DATA_STATS_LAYOUT))
 
         return stats, evt.status
 
@@ -1300,26 +1510,23 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_POOL_STATS, return_evt=True)
-        num_pools = evt.evt_params[0]
-
-        param_lens = [1]
-        param_lens.extend([2, 1, 1, 1, 2] * num_pools)
-
-        data = evt.get_return_params(param_lens=param_lens, use_raw=True)
-
-        stats = []
-        num_pools = data.pop(0)
-        for _ in range(num_pools):
-            stats.append(
-                PoolStats(
-                    buf_size=data.pop(0),
-                    num_buf=data.pop(0),
-                    num_alloc=data.pop(0),
-                    max_alloc=data.pop(0),
-                    max_req_len=data.pop(0),
-                )
+        evt = self.send_vs_command(_OCF_GET_POOL_STATS, return_evt=True)
+        param_bytes = evt.get_return_bytes()
+
+        # number of pools, followed by one fixed-size record per pool
+        records_len = param_bytes[0] * _POOL_STATS_STRUCT.size
+        if records_len > len(param_bytes) - 1:
+            raise ValueError(
+                "Expected and actual number of return bytes do not match. "
+                f"Expected={records_len + 1}, Actual={len(param_bytes)}"
+            )
+
+        stats = [
+            PoolStats(*record)
+            for record in _POOL_STATS_STRUCT.iter_unpack(
+                param_bytes[1 : 1 + records_len]
             )
+        ]
 
         return stats, evt.status
 
@@ -1348,12 +1555,11 @@ class VendorSpecificCmds:
             If `delay` is larger than 4 bytes in size.
 
         """
-        if byte_length(delay) > 4:
+        if delay >> 32:
             raise ValueError(f"Delay ({delay}) is too large, must be 4 bytes or less.")
 
-        params = to_le_nbyte_list(delay, 4)
-        params.append(handle)
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_AUX_DELAY, params=params)
+        params = _PACK_SET_AUX_DELAY(delay, handle)
+        return self.send_vs_command(_OCF_SET_AUX_DELAY, params=params)
 
     def set_ext_adv_data_fragmentation(
         self, handle: int, frag_length: int
@@ -1377,8 +1583,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        params = [handle, frag_length]
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_EXT_ADV_FRAG_LEN, params=params)
+        params = _PACK_SET_EXT_ADV_FRAG_LEN(handle, frag_length)
+        return self.send_vs_command(_OCF_SET_EXT_ADV_FRAG_LEN, params=params)
 
     def set_extended_advertising_phy_opts(
         self, handle: int, primary: int, secondary: int
@@ -1404,8 +1610,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        params = [handle, primary, secondary]
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_EXT_ADV_PHY_OPTS, params=params)
+        params = _PACK_SET_EXT_ADV_PHY_OPTS(handle, primary, secondary)
+        return self.send_vs_command(_OCF_SET_EXT_ADV_PHY_OPTS, params=params)
 
     def set_extended_advertising_default_phy_opts(self, phy_opts: int) -> StatusCode:
         """Set the extended advertising default TX PHY options.
@@ -1427,7 +1633,7 @@ class VendorSpecificCmds:
 
         """
         return self.send_vs_command(
-            OCF.VENDOR_SPEC.SET_EXT_ADV_DEF_PHY_OPTS, params=phy_opts
+            _OCF_SET_EXT_ADV_DEF_PHY_OPTS, params=bytes((phy_opts,))
         )
 
     def generate_iso_packets(
@@ -1461,19 +1667,17 @@ class VendorSpecificCmds:
             If `packet_len` is larger than 2 bytes in size.
 
         """
-        if byte_length(handle) > 2:
+        if handle >> 16:
             raise ValueError(
                 f"Handle ({handle}) is too large, must be 2 bytes or less."
             )
-        if byte_length(packet_len) > 2:
+        if packet_len >> 16:
             raise ValueError(
                 f"Packet length ({packet_len}) is too large, must be 2 bytes or less."
             )
 
-        params = to_le_nbyte_list(handle, 2)
-        params.extend(to_le_nbyte_list(packet_len, 2))
-        params.append(num_packets)
-        return self.send_vs_command(OCF.VENDOR_SPEC.GENERATE_ISO, params=params)
+        params = _PACK_GENERATE_ISO(handle, packet_len, num_packets)
+        return self.send_vs_command(_OCF_GENERATE_ISO, params=params)
 
     def get_iso_test_report(self) -> Tuple[TestReport, StatusCode]:
         """Get the stats collected during an ISO test.
@@ -1489,15 +1693,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_ISO_TEST_REPORT, return_evt=True)
-        data = evt.get_return_params(param_lens=[4, 4, 4, 4])
-
-        stats = TestReport(
-            rx_pkt_count=data[0],
-            rx_oct_count=data[1],
-            gen_pkt_count=data[2],
-            gen_oct_count=data[3],
-        )
+        evt = self.send_vs_command(_OCF_GET_ISO_TEST_REPORT, return_evt=True)
+        stats = TestReport(**_parse_stats(evt, _TEST_REPORT_LAYOUT))
 
         return stats, evt.status
 
@@ -1519,7 +1716,7 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        return self.send_vs_command(OCF.VENDOR_SPEC.ENA_ISO_SINK, params=int(enable))
+        return self.send_vs_command(_OCF_ENA_ISO_SINK, params=bytes((enable,)))
 
     def enable_autogen_iso_packets(self, packet_len: int) -> StatusCode:
         """Enable/disable automatic generation of ISO packets.
@@ -1545,13 +1742,13 @@ class VendorSpecificCmds:
             If `packet_len` is larger than 32 bits (4 bytes) in size.
 
         """
-        if packet_len > MAX_U32:
+        if packet_len >> 32:
             raise ValueError(
                 f"Packet length ({packet_len}) is too large, must be 4 bytes or less."
             )
 
-        params = to_le_nbyte_list(packet_len, 4)
-        return self.send_vs_command(OCF.VENDOR_SPEC.ENA_AUTO_GEN_ISO, params=params)
+        params = packet_len.to_bytes(4, "little")
+        return self.send_vs_command(_OCF_ENA_AUTO_GEN_ISO, params=params)
 
     def get_iso_connection_stats(self) -> Tuple[DataPktStats, StatusCode]:
         """Get the stats captured during an ISO connection.
@@ -1567,20 +1764,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_ISO_TEST_REPORT, return_evt=True)
-        data = evt.get_return_params(param_lens=[4, 4, 4, 4, 4, 2, 2, 2, 2])
-
-        stats = DataPktStats(
-            rx_data=data[0],
-            rx_data_crc=data[1],
-            rx_data_timeout=data[2],
-            tx_data=data[3],
-            err_data=data[4],
-            rx_setup=data[5],
-            tx_setup=data[6],
-            rx_isr=data[7],
-            tx_isr=data[8],
-        )
+        evt = self.send_vs_command(_OCF_GET_ISO_TEST_REPORT, return_evt=True)
+        stats = DataPktStats(**_parse_stats(evt, _DATA_STATS_LAYOUT))
 
         return stats, evt.status
 
@@ -1600,22 +1785,8 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_AUX_ADV_STATS, return_evt=True)
-        data = evt.get_return_params(param_lens=[4, 4, 4, 2, 4, 4, 4, 2, 2, 2, 2])
-
-        stats = AdvPktStats(
-            tx_adv=data[0],
-            rx_req=data[1],
-            rx_req_crc=data[2],
-            rx_req_timeout=data[3],
-            tx_resp=data[4],
-            tx_chain=data[5],
-            err_adv=data[6],
-            rx_setup=data[7],
-            tx_setup=data[8],
-            rx_isr=data[9],
-            tx_isr=data[10],
-        )
+        evt = self.send_vs_command(_OCF_GET_AUX_ADV_STATS, return_evt=True)
+        stats = AdvPktStats(**_parse_stats(evt, _AUX_ADV_STATS_LAYOUT))
 
         return stats, evt.status
 
@@ -1633,28 +1804,9 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_AUX_SCAN_STATS, return_evt=True)
-        data = evt.get_return_params(
-            param_lens=[4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 2, 2, 2, 2]
-        )
+        evt = self.send_vs_command(_OCF_GET_AUX_SCAN_STATS, return_evt=True)
+        stats = ScanPktStats(**_parse_stats(evt, _AUX_SCAN_STATS_LAYOUT))
 
-        stats = ScanPktStats(
-            rx_adv=data[0],
-            rx_adv_crc=data[1],
-            rx_adv_timeout=data[2],
-            tx_req=data[3],
-            rx_rsp=data[4],
-            rx_rsp_crc=data[5],
-            rx_rsp_timeout=data[6],
-            rx_chain=data[7],
-            rx_chain_crc=data[8],
-            rx_chain_timeout=data[9],
-            err_scan=data[10],
-            rx_setup=data[11],
-            tx_setup=data[12],
-            rx_isr=data[13],
-            tx_isr=data[14],
-        )
         return stats, evt.status
 
     def get_periodic_scanning_stats(self) -> Tuple[ScanPktStats, StatusCode]:
@@ -1671,22 +1823,9 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        evt = self.send_vs_command(OCF.VENDOR_SPEC.GET_PER_SCAN_STATS, return_evt=True)
-        data = evt.get_return_params(param_lens=[4, 4, 4, 4, 4, 4, 4, 2, 2, 2, 2])
-
-        stats = ScanPktStats(
-            rx_adv=data[0],
-            rx_adv_crc=data[1],
-            rx_adv_timeout=data[2],
-            rx_chain=data[3],
-            rx_chain_crc=data[4],
-            rx_chain_timeout=data[5],
-            err_scan=data[6],
-            rx_setup=data[7],
-            tx_setup=data[8],
-            rx_isr=data[9],
-            tx_isr=data[10],
-        )
+        evt = self.send_vs_command(_OCF_GET_PER_SCAN_STATS, return_evt=True)
+        stats = ScanPktStats(**_parse_stats(evt, _PER_SCAN_STATS_LAYOUT))
+
         return stats, evt.status
 
     def set_connection_phy_tx_power(
@@ -1718,7 +1857,7 @@ class VendorSpecificCmds:
             If `handle` is larger than 2 bytes in size.
 
         """
-        if byte_length(handle) > 2:
+        if handle >> 16:
             raise ValueError(
                 f"Handle ({handle}) is too large, must be 2 bytes or less."
             )
@@ -1726,10 +1865,8 @@ class VendorSpecificCmds:
         if phy == PhyOption.PHY_CODED_S2:
             phy = PhyOption.PHY_CODED
 
-        params = to_le_nbyte_list(handle, 2)
-        params.append(power)
-        params.append(phy.value)
-        return self.send_vs_command(OCF.VENDOR_SPEC.SET_CONN_PHY_TX_PWR, params=params)
+        params = _PACK_SET_CONN_PHY_TX_PWR(handle, power, phy.value)
+        return self.send_vs_command(_OCF_SET_CONN_PHY_TX_PWR, params=params)
 
     def get_rssi_vs(self, channel: int = 0) -> Tuple[int, StatusCode]:
         """Get the RSSI values.
@@ -1745,7 +1882,8 @@ class VendorSpecificCmds:
         Returns
         -------
         int
-            RSSI value for the indicated channel.
+            RSSI value for the indicated channel, or 0 if the
+            command failed.
         StatusCode
             The return packet status code.
 
@@ -1761,9 +1899,14 @@ class VendorSpecificCmds:
             )
 
         evt = self.send_vs_command(
-            OCF.VENDOR_SPEC.GET_RSSI, params=channel, return_evt=True
+            _OCF_GET_RSSI, params=bytes((channel,)), return_evt=True
         )
-        rssi = evt.get_return_params(signed=True)
+        param_bytes = evt.get_return_bytes()
+        if evt.status != StatusCode.SUCCESS or not param_bytes:
+            # failed or short replies carry no RSSI byte
+            return 0, evt.status
+
+        (rssi,) = _UNPACK_RSSI(param_bytes)
 
         if rssi == -128:
             self.logger.warning("RSSI= -128, possible timeout occured")
@@ -1779,7 +1922,7 @@ class VendorSpecificCmds:
             The return packet status code.
 
         """
-        return self.send_vs_command(OCF.VENDOR_SPEC.RESET_ADV_STATS)
+        return self.send_vs_command(_OCF_RESET_ADV_STATS)
 
     def reset_scan_stats(self) -> StatusCode:
         """Reset accumulated scanning stats
@@ -1789,4 +1932,4 @@ class VendorSpecificCmds:
         StatusCode
             The return packet status code.
         """
-        return self.send_vs_command(OCF.VENDOR_SPEC.RESET_SCAN_STATS)
+        return self.send_vs_command(_OCF_RESET_SCAN_STATS)
@@ -8,6 +8,8 @@ if os.path.exists("../src"):
 
 from max_ble_hci import BleHci
 from max_ble_hci import packet_codes as pc
+from max_ble_hci.hci_packets import CommandPacket
+from max_ble_hci.packet_defs import OCF, OGF
 
 from max_ble_hci.constants import PhyOption, PubKeyValidateMode
 
@@ -16,6 +18,7 @@ PORT = ""
 hci1 = BleHci(PORT, id_tag="hci1", timeout=5)
 
 MAX_U32 = 0xFFFFFFFF
+MAX_U64 = 0xFFFFFFFFFFFFFFFF
 A32 = 0xAAAAAAAA
 
 
@@ -32,6 +35,10 @@ class TestHci(unittest.TestCase):
 
         key = list(secrets.token_bytes(32))
         self.assertEqual(hci1.set_256_priv_key(key), pc.StatusCode.SUCCESS)
+        self.assertEqual(
+            hci1.set_256_priv_key(int.from_bytes(key, "big")), pc.StatusCode.SUCCESS
+        )
+        self.assertEqual(hci1.set_256_priv_key(0), pc.StatusCode.SUCCESS)
         self.assertEqual(
             hci1.get_channel_map_periodic_scan_adv(1, False)[1],
             pc.StatusCode.SUCCESS,
@@ -68,12 +75,31 @@ class TestHci(unittest.TestCase):
 
         self.assertEqual(hci1.set_diagnostic_mode(True), pc.StatusCode.SUCCESS)
 
+    def test_pipelined_commands(self):
+        self.assertEqual(
+            hci1.setup(event_mask=MAX_U64, le_event_mask=MAX_U64, default_phy=True),
+            pc.StatusCode.SUCCESS,
+        )
+
+        cmds = [
+            CommandPacket(OGF.INFORMATIONAL, OCF.INFORMATIONAL.READ_LOCAL_VER_INFO),
+            CommandPacket(OGF.INFORMATIONAL, OCF.INFORMATIONAL.READ_BD_ADDR),
+            CommandPacket(OGF.LE_CONTROLLER, OCF.LE_CONTROLLER.READ_BUF_SIZE),
+        ]
+        evts = hci1.write_commands(cmds)
+
+        self.assertEqual(len(evts), len(cmds))
+        for cmd, evt in zip(cmds, evts):
+            self.assertEqual(evt.evt_params[1] | (evt.evt_params[2] << 8), cmd.opcode)
+            self.assertEqual(evt.status, pc.StatusCode.SUCCESS)
+
     def test_stats(self):
         stats, status = hci1.get_pdu_filter_stats()
         self.assertTrue(stats is not None and status == pc.StatusCode.SUCCESS)
 
         stats, status = hci1.get_memory_stats()
         self.assertTrue(stats is not None and status == pc.StatusCode.SUCCESS)
+        self.assertIsNotNone(hci1.get_pool_stats())
 
         stats, status = hci1.get_adv_stats()
         self.assertTrue(stats is not None and status == pc.StatusCode.SUCCESS)